@@ -0,0 +1,147 @@
+import { NextRequest } from 'next/server'
+import { GET } from '@/app/api/cron/forecasts/route'
+import { PredictiveAnalytics } from '@/lib/analytics/predictive-analytics'
+import { supabaseAdmin } from '@/lib/supabase/admin'
+
+jest.mock('@/lib/analytics/predictive-analytics')
+
+describe('Forecast Precompute Cron API', () => {
+  const originalSecret = process.env.CRON_SECRET
+  const computeDemandForecasts = jest.fn()
+  const storeDemandForecasts = jest.fn()
+  const pruneExpiredDemandForecasts = jest.fn()
+
+  const query = {
+    select: jest.fn(),
+    eq: jest.fn(),
+    neq: jest.fn(),
+    order: jest.fn(),
+    limit: jest.fn(),
+  }
+
+  const request = (authorization = 'Bearer test-secret') =>
+    new NextRequest('http://localhost:3000/api/cron/forecasts', {
+      headers: { authorization },
+    })
+
+  beforeEach(() => {
+    jest.clearAllMocks()
+    computeDemandForecasts.mockReset()
+    query.limit.mockReset()
+    process.env.CRON_SECRET = 'test-secret'
+    // An even day number, so the run starts at the first organization
+    jest.useFakeTimers().setSystemTime(new Date('2025-01-02T01:00:00Z'))
+
+    query.select.mockReturnValue(query)
+    query.eq.mockReturnValue(query)
+    query.neq.mockReturnValue(query)
+    query.order.mockReturnValue(query)
+    ;(supabaseAdmin.from as jest.Mock).mockReturnValue(query)
+    ;(PredictiveAnalytics as unknown as jest.Mock).mockImplementation(() => ({
+      computeDemandForecasts,
+      storeDemandForecasts,
+      pruneExpiredDemandForecasts,
+    }))
+  })
+
+  afterEach(() => {
+    jest.useRealTimers()
+  })
+
+  afterAll(() => {
+    process.env.CRON_SECRET = originalSecret
+  })
+
+  // The organization list is the first query to reach order()
+  const mockOrganizations = (ids: string[]) =>
+    query.order.mockResolvedValueOnce({
+      data: ids.map((id) => ({ id })),
+      error: null,
+    })
+
+  it('should reject requests without the cron secret', async () => {
+    const response = await GET(request('Bearer wrong'))
+
+    expect(response.status).toBe(401)
+    expect(supabaseAdmin.from).not.toHaveBeenCalled()
+  })
+
+  it('should store forecasts for each organization', async () => {
+    mockOrganizations(['org-1'])
+    query.limit.mockResolvedValueOnce({
+      data: [{ id: 'p1' }, { id: 'p2' }],
+      error: null,
+    })
+    const forecasts = [{ productId: 'p1' }, { productId: 'p2' }]
+    computeDemandForecasts.mockResolvedValueOnce(forecasts)
+
+    const response = await GET(request())
+
+    expect(response.status).toBe(200)
+    const data = await response.json()
+    expect(data.results).toEqual({
+      organizations: 1,
+      forecasts: 2,
+      failures: 0,
+      skipped: 0,
+    })
+    expect(computeDemandForecasts).toHaveBeenCalledWith(['p1', 'p2'], 30)
+    expect(storeDemandForecasts).toHaveBeenCalledWith('org-1', forecasts, 30)
+    expect(pruneExpiredDemandForecasts).toHaveBeenCalledWith('org-1')
+  })
+
+  it('should count organizations whose history lookup fails', async () => {
+    mockOrganizations(['org-1', 'org-2'])
+    query.limit
+      .mockResolvedValueOnce({ data: [{ id: 'p1' }], error: null })
+      .mockResolvedValueOnce({ data: [{ id: 'p2' }], error: null })
+    computeDemandForecasts
+      .mockRejectedValueOnce(new Error('Database error'))
+      .mockResolvedValueOnce([{ productId: 'p2' }])
+
+    const response = await GET(request())
+
+    const data = await response.json()
+    expect(data.results).toEqual({
+      organizations: 1,
+      forecasts: 1,
+      failures: 1,
+      skipped: 0,
+    })
+    expect(storeDemandForecasts).toHaveBeenCalledTimes(1)
+    expect(storeDemandForecasts).toHaveBeenCalledWith(
+      'org-2',
+      [{ productId: 'p2' }],
+      30
+    )
+  })
+
+  it('should stop starting organizations at the time budget', async () => {
+    mockOrganizations(['org-1', 'org-2'])
+    query.limit.mockResolvedValue({ data: [{ id: 'p1' }], error: null })
+    computeDemandForecasts.mockImplementation(async () => {
+      jest.setSystemTime(Date.now() + 241 * 1000)
+      return [{ productId: 'p1' }]
+    })
+
+    const response = await GET(request())
+
+    const data = await response.json()
+    expect(data.results).toMatchObject({ organizations: 1, skipped: 1 })
+    expect(storeDemandForecasts).toHaveBeenCalledTimes(1)
+  })
+
+  it('should start at a different organization each day', async () => {
+    jest.setSystemTime(new Date('2025-01-03T01:00:00Z'))
+    mockOrganizations(['org-1', 'org-2'])
+    query.limit.mockResolvedValue({ data: [{ id: 'p1' }], error: null })
+    computeDemandForecasts.mockResolvedValue([{ productId: 'p1' }])
+
+    await GET(request())
+
+    expect(storeDemandForecasts.mock.calls.map(([orgId]) => orgId)).toEqual([
+      'org-2',
+      'org-1',
+    ])
+  })
+})
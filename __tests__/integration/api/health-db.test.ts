@@ -0,0 +1,39 @@
+import { GET } from '@/app/api/health/db/route'
+import { supabaseAdmin } from '@/lib/supabase/admin'
+
+describe('Database Health API', () => {
+  const query = {
+    select: jest.fn(),
+    limit: jest.fn(),
+  }
+
+  beforeEach(() => {
+    jest.clearAllMocks()
+    query.select.mockReturnValue(query)
+    ;(supabaseAdmin.from as jest.Mock).mockReturnValue(query)
+  })
+
+  it('should return 200 when the database answers', async () => {
+    query.limit.mockResolvedValueOnce({ error: null })
+
+    const response = await GET()
+
+    expect(response.status).toBe(200)
+    const data = await response.json()
+    expect(data.status).toBe('ok')
+    expect(typeof data.latencyMs).toBe('number')
+    expect(query.select).toHaveBeenCalledWith('id', { head: true })
+  })
+
+  it('should return 503 when the query fails', async () => {
+    query.limit.mockResolvedValueOnce({
+      error: new Error('connection refused'),
+    })
+
+    const response = await GET()
+
+    expect(response.status).toBe(503)
+    const data = await response.json()
+    expect(data.status).toBe('error')
+  })
+})
@@ -0,0 +1,91 @@
+import {
+  analyzeSeasonality,
+  getPredictiveMetrics,
+} from '@/app/actions/advanced-analytics'
+import { PredictiveAnalytics } from '@/lib/analytics/predictive-analytics'
+import { createClient } from '@/lib/supabase/server'
+
+jest.mock('@/lib/supabase/server', () => ({
+  createClient: jest.fn(),
+}))
+
+jest.mock('@/lib/rate-limit', () => ({
+  rateLimiters: { analytics: {} },
+  checkRateLimit: jest.fn().mockResolvedValue({ success: true }),
+}))
+
+jest.mock('@/lib/analytics/predictive-analytics')
+
+// QueryCache starts a cleanup interval per namespace
+jest.useFakeTimers()
+
+describe('Advanced Analytics Actions', () => {
+  const analysis = {
+    productId: 'p1',
+    seasonalityScore: 0.4,
+    peakSeasons: ['December'],
+    lowSeasons: ['February'],
+    seasonalFactors: {},
+  }
+  const analyzeSeasonalityMock = jest.fn()
+
+  let orgCounter = 0
+  let profile: { organization_id: string } | null
+
+  // The schemas expect arrays, which real FormData cannot carry
+  const seasonalityForm = (productIds: string[]) =>
+    new Map([['productIds', productIds]]) as unknown as FormData
+
+  const createMockSupabase = (userId: string) => ({
+    auth: {
+      getUser: jest.fn().mockResolvedValue({ data: { user: { id: userId } } }),
+    },
+    from: jest.fn((table: string) => {
+      const query: any = {
+        select: jest.fn(() => query),
+        single: jest.fn(() => Promise.resolve({ data: profile })),
+        eq: jest.fn(() =>
+          table === 'products'
+            ? Promise.resolve({ data: [{ id: 'p1' }, { id: 'p2' }] })
+            : query
+        ),
+      }
+      return query
+    }),
+  })
+
+  beforeEach(() => {
+    jest.clearAllMocks()
+    // Caches live for the module, so give every test its own organization
+    profile = { organization_id: `org-${++orgCounter}` }
+    analyzeSeasonalityMock.mockResolvedValue([analysis])
+    ;(PredictiveAnalytics as unknown as jest.Mock).mockImplementation(() => ({
+      analyzeSeasonality: analyzeSeasonalityMock,
+      generateDemandForecast: jest.fn().mockResolvedValue([]),
+      optimizePricing: jest.fn().mockResolvedValue([]),
+      predictChurnRisk: jest.fn().mockResolvedValue([]),
+    }))
+  })
+
+  it('should share cached seasonality across users and actions of an organization', async () => {
+    ;(createClient as jest.Mock).mockReturnValue(createMockSupabase('user-1'))
+    const first = await analyzeSeasonality(seasonalityForm(['p2', 'p1']))
+
+    ;(createClient as jest.Mock).mockReturnValue(createMockSupabase('user-2'))
+    const metrics = await getPredictiveMetrics()
+
+    expect(first).toEqual({ success: true, data: [analysis] })
+    expect(metrics.success).toBe(true)
+    expect(analyzeSeasonalityMock).toHaveBeenCalledTimes(1)
+  })
+
+  it('should require a user profile to analyze seasonality', async () => {
+    profile = null
+    ;(createClient as jest.Mock).mockReturnValue(createMockSupabase('user-1'))
+
+    const result = await analyzeSeasonality(seasonalityForm(['p1']))
+
+    expect(result).toEqual({ error: 'User profile not found' })
+    expect(analyzeSeasonalityMock).not.toHaveBeenCalled()
+  })
+})
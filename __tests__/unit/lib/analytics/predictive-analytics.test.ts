@@ -0,0 +1,523 @@
+import { PredictiveAnalytics } from '@/lib/analytics/predictive-analytics'
+
+describe('PredictiveAnalytics', () => {
+  let analytics: PredictiveAnalytics
+  let mockSupabase: ReturnType<typeof createMockSupabase>
+
+  const timeRange = {
+    start: new Date('2024-01-01T00:00:00Z'),
+    end: new Date('2024-01-31T23:59:59Z'),
+  }
+
+  beforeEach(() => {
+    jest.clearAllMocks()
+    mockSupabase = createMockSupabase()
+    analytics = new PredictiveAnalytics(mockSupabase)
+  })
+
+  describe('detectStatisticalAnomalies', () => {
+    it('should flag values more than 2 standard deviations from the mean', () => {
+      const values = Float64Array.from([
+        ...Array.from({ length: 20 }, () => 10),
+        100,
+      ])
+
+      const anomalies = (analytics as any).detectStatisticalAnomalies(
+        values,
+        'demand'
+      )
+
+      expect(anomalies).toHaveLength(1)
+      expect(anomalies[0].id).toBe('anomaly_demand_20')
+      expect(anomalies[0].data.value).toBe(100)
+      expect(anomalies[0].severity).toBe('critical')
+    })
+
+    it('should compute population mean and standard deviation', () => {
+      const values = [2, 4, 4, 4, 5, 5, 7, 9, 30]
+
+      const anomalies = (analytics as any).detectStatisticalAnomalies(
+        Float64Array.from(values),
+        'demand'
+      )
+
+      const mean = values.reduce((sum, v) => sum + v, 0) / values.length
+      const stdDev = Math.sqrt(
+        values.reduce((sum, v) => sum + (v - mean) ** 2, 0) / values.length
+      )
+
+      expect(anomalies).toHaveLength(1)
+      expect(anomalies[0].data.mean).toBeCloseTo(mean, 10)
+      expect(anomalies[0].data.stdDev).toBeCloseTo(stdDev, 10)
+    })
+
+    it('should return every outlier, strongest first', () => {
+      const values = Float64Array.from([
+        ...Array.from({ length: 500 }, () => 10),
+        ...Array.from({ length: 30 }, (_, i) => 100 + i),
+      ])
+
+      const anomalies = (analytics as any).detectStatisticalAnomalies(
+        values,
+        'demand'
+      )
+
+      expect(anomalies).toHaveLength(30)
+      expect(anomalies[0].data.value).toBe(129)
+      for (let i = 1; i < anomalies.length; i++) {
+        expect(anomalies[i - 1].data.zScore).toBeGreaterThanOrEqual(
+          anomalies[i].data.zScore
+        )
+      }
+    })
+
+    it('should return no anomalies for empty data', () => {
+      const anomalies = (analytics as any).detectStatisticalAnomalies(
+        new Float64Array(0),
+        'demand'
+      )
+
+      expect(anomalies).toEqual([])
+    })
+
+    it('should return no anomalies for a constant series', () => {
+      const anomalies = (analytics as any).detectStatisticalAnomalies(
+        new Float64Array(10).fill(5),
+        'demand'
+      )
+
+      expect(anomalies).toEqual([])
+    })
+  })
+
+  describe('generateDemandForecast', () => {
+    it('should fetch all products in one query and group rows by product', async () => {
+      mockPages(mockSupabase, [
+        [
+          {
+            product_id: 'p1',
+            quantity: 10,
+            created_at: '2024-01-01T12:00:00Z',
+          },
+          { product_id: 'p3', quantity: 4, created_at: '2024-01-02T12:00:00Z' },
+          {
+            product_id: 'p1',
+            quantity: 10,
+            created_at: '2024-01-03T12:00:00Z',
+          },
+        ],
+      ])
+
+      const forecasts = await analytics.generateDemandForecast(
+        ['p1', 'p2', 'p3'],
+        30
+      )
+
+      expect(mockSupabase.from).toHaveBeenCalledTimes(1)
+      expect(mockSupabase.query.in).toHaveBeenCalledWith('product_id', [
+        'p1',
+        'p2',
+        'p3',
+      ])
+      expect(forecasts.map((f) => f.productId)).toEqual(['p1', 'p3'])
+    })
+
+    it('should split large product lists into batches', async () => {
+      const productIds = Array.from({ length: 250 }, (_, i) => `p${i}`)
+      mockPages(mockSupabase, [[], []])
+
+      await analytics.generateDemandForecast(productIds, 30)
+
+      expect(mockSupabase.query.in).toHaveBeenCalledTimes(2)
+      expect(mockSupabase.query.in.mock.calls[0][1]).toHaveLength(200)
+      expect(mockSupabase.query.in.mock.calls[1][1]).toHaveLength(50)
+    })
+
+    it('should return an empty list when the query fails', async () => {
+      mockSupabase.query.range.mockResolvedValueOnce({
+        data: null,
+        error: new Error('Database error'),
+      })
+
+      const forecasts = await analytics.generateDemandForecast(['p1'], 30)
+
+      expect(forecasts).toEqual([])
+    })
+  })
+
+  describe('computeDemandForecasts', () => {
+    it('should propagate history lookup failures', async () => {
+      mockSupabase.query.range.mockResolvedValueOnce({
+        data: null,
+        error: new Error('Database error'),
+      })
+
+      await expect(
+        analytics.computeDemandForecasts(['p1'], 30)
+      ).rejects.toThrow('Database error')
+    })
+  })
+
+  describe('getDemandForecasts', () => {
+    const storedForecast = {
+      predictedDemand: 42,
+      confidence: 85,
+      seasonality: 0,
+      trend: 'stable',
+      factors: ['historical_sales'],
+    }
+
+    it('should serve fresh stored forecasts and compute the rest live', async () => {
+      mockSupabase.query.gt.mockResolvedValueOnce({
+        data: [
+          {
+            entity_id: 'p1',
+            prediction_value: { forecastPeriod: 30, ...storedForecast },
+          },
+          {
+            entity_id: 'p2',
+            prediction_value: { forecastPeriod: 7, ...storedForecast },
+          },
+        ],
+        error: null,
+      })
+      mockPages(mockSupabase, [
+        [{ product_id: 'p2', quantity: 5, created_at: '2024-01-01T12:00:00Z' }],
+      ])
+
+      const forecasts = await analytics.getDemandForecasts(
+        'org-1',
+        ['p1', 'p2'],
+        30
+      )
+
+      expect(mockSupabase.from).toHaveBeenCalledWith('ai_predictions')
+      expect(mockSupabase.query.eq).toHaveBeenCalledWith(
+        'organization_id',
+        'org-1'
+      )
+      // Only p1 matched the requested period, so p2 is computed live
+      expect(mockSupabase.query.in).toHaveBeenLastCalledWith('product_id', [
+        'p2',
+      ])
+      expect(forecasts.map((f) => f.productId)).toEqual(['p1', 'p2'])
+      expect(forecasts[0]).toEqual({ productId: 'p1', ...storedForecast })
+    })
+
+    it('should serve the newest stored run for each product', async () => {
+      mockSupabase.query.gt.mockResolvedValueOnce({
+        data: [
+          {
+            entity_id: 'p1',
+            prediction_value: {
+              forecastPeriod: 30,
+              ...storedForecast,
+              predictedDemand: 40,
+            },
+          },
+          {
+            entity_id: 'p1',
+            prediction_value: { forecastPeriod: 30, ...storedForecast },
+          },
+        ],
+        error: null,
+      })
+
+      const forecasts = await analytics.getDemandForecasts('org-1', ['p1'], 30)
+
+      expect(mockSupabase.query.order).toHaveBeenCalledWith(
+        'prediction_date',
+        { ascending: true }
+      )
+      expect(forecasts).toEqual([{ productId: 'p1', ...storedForecast }])
+    })
+
+    it('should fall back to live forecasts when the lookup fails', async () => {
+      mockSupabase.query.gt.mockResolvedValueOnce({
+        data: null,
+        error: new Error('Database error'),
+      })
+      mockPages(mockSupabase, [
+        [{ product_id: 'p1', quantity: 5, created_at: '2024-01-01T12:00:00Z' }],
+      ])
+
+      const forecasts = await analytics.getDemandForecasts('org-1', ['p1'], 30)
+
+      expect(forecasts).toHaveLength(1)
+      expect(forecasts[0]?.factors).toContain('trend_analysis')
+    })
+  })
+
+  describe('storeDemandForecasts', () => {
+    it('should upsert one prediction row per product', async () => {
+      mockSupabase.query.upsert.mockResolvedValueOnce({ error: null })
+
+      await analytics.storeDemandForecasts(
+        'org-1',
+        [
+          {
+            productId: 'p1',
+            predictedDemand: 42,
+            confidence: 85,
+            seasonality: 0,
+            trend: 'stable',
+            factors: [],
+          },
+        ],
+        30
+      )
+
+      expect(mockSupabase.from).toHaveBeenCalledWith('ai_predictions')
+      const [rows, options] = mockSupabase.query.upsert.mock.calls[0]
+      expect(rows).toEqual([
+        expect.objectContaining({
+          organization_id: 'org-1',
+          prediction_type: 'demand_forecast',
+          entity_type: 'product',
+          entity_id: 'p1',
+          confidence_score: 0.85,
+          prediction_value: expect.objectContaining({
+            forecastPeriod: 30,
+            predictedDemand: 42,
+          }),
+        }),
+      ])
+      expect(options.onConflict).toBe(
+        'organization_id,prediction_type,entity_type,entity_id,prediction_date'
+      )
+    })
+  })
+
+  describe('pruneExpiredDemandForecasts', () => {
+    it("should delete only the organization's expired stored forecasts", async () => {
+      mockSupabase.query.lt.mockResolvedValueOnce({ error: null })
+
+      await analytics.pruneExpiredDemandForecasts('org-1')
+
+      expect(mockSupabase.from).toHaveBeenCalledWith('ai_predictions')
+      expect(mockSupabase.query.delete).toHaveBeenCalled()
+      expect(mockSupabase.query.eq).toHaveBeenCalledWith(
+        'organization_id',
+        'org-1'
+      )
+      expect(mockSupabase.query.eq).toHaveBeenCalledWith(
+        'prediction_type',
+        'demand_forecast'
+      )
+      expect(mockSupabase.query.lt).toHaveBeenCalledWith(
+        'expires_at',
+        expect.any(String)
+      )
+    })
+
+    it('should throw when the delete fails', async () => {
+      mockSupabase.query.lt.mockResolvedValueOnce({
+        error: new Error('Database error'),
+      })
+
+      await expect(
+        analytics.pruneExpiredDemandForecasts('org-1')
+      ).rejects.toThrow('Database error')
+    })
+  })
+
+  describe('calculateDemandForecast', () => {
+    it('should compare the oldest and newest ten sales for the trend', async () => {
+      mockPages(mockSupabase, [
+        Array.from({ length: 20 }, (_, i) => ({
+          product_id: 'p1',
+          quantity: i < 10 ? 5 : 15,
+          created_at: '2024-03-15T12:00:00Z',
+        })),
+      ])
+
+      const [forecast] = await analytics.generateDemandForecast(['p1'], 30)
+
+      // Average demand 10, increasing trend adds 10%
+      expect(forecast?.trend).toBe('increasing')
+      expect(forecast?.predictedDemand).toBe(330)
+    })
+
+    it('should derive the seasonality factor from the peak month', async () => {
+      mockPages(mockSupabase, [
+        [
+          {
+            product_id: 'p1',
+            quantity: 10,
+            created_at: '2024-01-15T12:00:00Z',
+          },
+          {
+            product_id: 'p1',
+            quantity: 20,
+            created_at: '2024-01-20T12:00:00Z',
+          },
+          {
+            product_id: 'p1',
+            quantity: 30,
+            created_at: '2024-07-15T12:00:00Z',
+          },
+        ],
+      ])
+
+      const [forecast] = await analytics.generateDemandForecast(['p1'], 30)
+
+      // Monthly averages are Jan 15, Jul 30 and 0 elsewhere; overall 3.75
+      expect(forecast?.seasonality).toBeCloseTo(7, 10)
+    })
+  })
+
+  describe('analyzeSeasonality', () => {
+    it('should build the analysis from monthly demand aggregates', async () => {
+      mockSupabase.rpc.mockResolvedValueOnce({
+        data: [
+          { product_id: 'p1', month: 1, avg_quantity: 15, total_quantity: 30 },
+          { product_id: 'p1', month: 7, avg_quantity: 30, total_quantity: 30 },
+        ],
+        error: null,
+      })
+
+      const analyses = await analytics.analyzeSeasonality(['p1', 'p2'])
+
+      expect(mockSupabase.rpc).toHaveBeenCalledWith(
+        'get_monthly_demand',
+        expect.objectContaining({ p_product_ids: ['p1', 'p2'] })
+      )
+      expect(mockSupabase.from).not.toHaveBeenCalled()
+
+      // Monthly averages are Jan 15, Jul 30 and 0 elsewhere; overall 3.75
+      expect(analyses).toHaveLength(1)
+      const analysis = analyses[0]
+      expect(analysis?.productId).toBe('p1')
+      expect(analysis?.seasonalityScore).toBeCloseTo(8, 10)
+      expect(analysis?.seasonalFactors.January).toBeCloseTo(4, 10)
+      expect(analysis?.seasonalFactors.July).toBeCloseTo(8, 10)
+      expect(analysis?.seasonalFactors.March).toBe(0)
+      expect(analysis?.peakSeasons).toEqual(['January', 'July'])
+      expect(analysis?.lowSeasons).toHaveLength(10)
+    })
+
+    it('should return an empty list when the aggregate query fails', async () => {
+      mockSupabase.rpc.mockResolvedValueOnce({
+        data: null,
+        error: new Error('Database error'),
+      })
+
+      const analyses = await analytics.analyzeSeasonality(['p1'])
+
+      expect(analyses).toEqual([])
+    })
+  })
+
+  describe('calculatePriceOptimization', () => {
+    it('should compare demand in the cheaper and dearer halves of sales', () => {
+      const optimization = (analytics as any).calculatePriceOptimization(
+        { base_price: 20, current_price: 20 },
+        [
+          { unit_price: 20, quantity: 10 },
+          { unit_price: 10, quantity: 30 },
+          { unit_price: 20, quantity: 10 },
+          { unit_price: 10, quantity: 30 },
+        ]
+      )
+
+      // Doubling the price cut quantity from 30 to 10
+      expect(optimization.elasticity).toBeCloseTo(-2 / 3, 10)
+    })
+
+    it('should fall back to the default elasticity with too few sales', () => {
+      const optimization = (analytics as any).calculatePriceOptimization(
+        { base_price: 20, current_price: 20 },
+        [{ unit_price: 20, quantity: 10 }]
+      )
+
+      expect(optimization.elasticity).toBe(-1)
+    })
+  })
+
+  describe('detectAnomalies', () => {
+    it('should read the value column for each data type', async () => {
+      mockPages(mockSupabase, [
+        [
+          ...Array.from({ length: 20 }, () => ({ unit_price: 25 })),
+          { unit_price: 250 },
+        ],
+      ])
+
+      const anomalies = await analytics.detectAnomalies('price', timeRange)
+
+      expect(mockSupabase.from).toHaveBeenCalledWith('order_items')
+      expect(mockSupabase.query.select).toHaveBeenCalledWith('unit_price')
+      expect(anomalies).toHaveLength(1)
+      expect(anomalies[0]?.data.value).toBe(250)
+    })
+
+    it('should page through results until a short page is returned', async () => {
+      const fullPage = Array.from({ length: 1000 }, () => ({
+        total_amount: 1000,
+      }))
+      mockPages(mockSupabase, [
+        fullPage,
+        fullPage,
+        [{ total_amount: 1000 }, { total_amount: 90000 }],
+      ])
+
+      const anomalies = await analytics.detectAnomalies('revenue', timeRange)
+
+      expect(mockSupabase.from).toHaveBeenCalledWith('orders')
+      expect(mockSupabase.query.range).toHaveBeenNthCalledWith(1, 0, 999)
+      expect(mockSupabase.query.range).toHaveBeenNthCalledWith(2, 1000, 1999)
+      expect(mockSupabase.query.range).toHaveBeenNthCalledWith(3, 2000, 2999)
+      expect(anomalies).toHaveLength(1)
+      expect(anomalies[0]?.id).toBe('anomaly_revenue_2001')
+    })
+
+    it('should return an empty list when the query fails', async () => {
+      mockSupabase.query.range.mockResolvedValueOnce({
+        data: null,
+        error: new Error('Database error'),
+      })
+
+      const anomalies = await analytics.detectAnomalies('demand', timeRange)
+
+      expect(anomalies).toEqual([])
+    })
+  })
+})
+
+function createMockSupabase() {
+  const query = {
+    select: jest.fn(),
+    eq: jest.fn(),
+    in: jest.fn(),
+    gt: jest.fn(),
+    gte: jest.fn(),
+    lte: jest.fn(),
+    order: jest.fn(),
+    range: jest.fn(),
+    upsert: jest.fn(),
+    delete: jest.fn(),
+    lt: jest.fn(),
+  }
+  query.select.mockReturnValue(query)
+  query.eq.mockReturnValue(query)
+  query.in.mockReturnValue(query)
+  query.gte.mockReturnValue(query)
+  query.lte.mockReturnValue(query)
+  query.order.mockReturnValue(query)
+  query.delete.mockReturnValue(query)
+
+  return {
+    query,
+    from: jest.fn().mockReturnValue(query),
+    rpc: jest.fn(),
+  }
+}
+
+function mockPages(
+  mockSupabase: ReturnType<typeof createMockSupabase>,
+  pages: any[][]
+) {
+  for (const page of pages) {
+    mockSupabase.query.range.mockResolvedValueOnce({ data: page, error: null })
+  }
+}
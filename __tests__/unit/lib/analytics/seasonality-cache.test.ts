@@ -0,0 +1,80 @@
+import type { SeasonalityAnalysis } from '@/lib/analytics/predictive-analytics'
+import { getCachedSeasonality } from '@/lib/analytics/seasonality-cache'
+
+// QueryCache starts a cleanup interval per namespace
+jest.useFakeTimers()
+
+describe('getCachedSeasonality', () => {
+  const analysis: SeasonalityAnalysis = {
+    productId: 'p1',
+    seasonalityScore: 0.4,
+    peakSeasons: ['December'],
+    lowSeasons: ['February'],
+    seasonalFactors: {},
+  }
+
+  let analytics: { analyzeSeasonality: jest.Mock }
+  let orgCounter = 0
+  let organizationId: string
+
+  beforeEach(() => {
+    analytics = { analyzeSeasonality: jest.fn() }
+    // Caches live for the module, so give every test its own organization
+    organizationId = `org-${++orgCounter}`
+  })
+
+  it('should serve repeat requests from the cache', async () => {
+    analytics.analyzeSeasonality.mockResolvedValue([analysis])
+
+    const first = await getCachedSeasonality(
+      analytics as any,
+      organizationId,
+      ['p1', 'p2']
+    )
+    const second = await getCachedSeasonality(
+      analytics as any,
+      organizationId,
+      ['p2', 'p1']
+    )
+
+    expect(first).toEqual([analysis])
+    expect(second).toEqual([analysis])
+    expect(analytics.analyzeSeasonality).toHaveBeenCalledTimes(1)
+  })
+
+  it('should not cache empty results', async () => {
+    analytics.analyzeSeasonality.mockResolvedValue([])
+
+    await getCachedSeasonality(analytics as any, organizationId, ['p1'])
+    await getCachedSeasonality(analytics as any, organizationId, ['p1'])
+
+    expect(analytics.analyzeSeasonality).toHaveBeenCalledTimes(2)
+  })
+
+  it('should keep organizations apart', async () => {
+    analytics.analyzeSeasonality.mockResolvedValue([analysis])
+
+    await getCachedSeasonality(analytics as any, organizationId, ['p1'])
+    await getCachedSeasonality(analytics as any, 'another-org', ['p1'])
+
+    expect(analytics.analyzeSeasonality).toHaveBeenCalledTimes(2)
+  })
+
+  it('should share one computation between concurrent misses', async () => {
+    let resolve: (value: SeasonalityAnalysis[]) => void = () => {}
+    analytics.analyzeSeasonality.mockReturnValue(
+      new Promise((r) => {
+        resolve = r
+      })
+    )
+
+    const pending = Promise.all([
+      getCachedSeasonality(analytics as any, organizationId, ['p1']),
+      getCachedSeasonality(analytics as any, organizationId, ['p1']),
+    ])
+    resolve([analysis])
+
+    expect(await pending).toEqual([[analysis], [analysis]])
+    expect(analytics.analyzeSeasonality).toHaveBeenCalledTimes(1)
+  })
+})
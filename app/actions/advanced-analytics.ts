@@ -2,6 +2,7 @@
 
 import { z } from 'zod'
 import { PredictiveAnalytics } from '@/lib/analytics/predictive-analytics'
+import { getCachedSeasonality } from '@/lib/analytics/seasonality-cache'
 import { checkRateLimit, rateLimiters } from '@/lib/rate-limit'
 import { createClient } from '@/lib/supabase/server'
 
@@ -56,11 +57,25 @@ export async function generateDemandForecast(formData: FormData) {
 
     const parsed = DemandForecastSchema.parse(Object.fromEntries(formData))
 
+    const { data: profile } = await supabase
+      .from('user_profiles')
+      .select('organization_id')
+      .eq('user_id', user.id)
+      .single()
+
     const analytics = new PredictiveAnalytics(supabase)
-    const forecasts = await analytics.generateDemandForecast(
-      parsed.productIds,
-      parsed.forecastPeriod
-    )
+
+    // Serve the nightly precomputed forecasts where available
+    const forecasts = profile?.organization_id
+      ? await analytics.getDemandForecasts(
+          profile.organization_id,
+          parsed.productIds,
+          parsed.forecastPeriod
+        )
+      : await analytics.generateDemandForecast(
+          parsed.productIds,
+          parsed.forecastPeriod
+        )
 
     return { success: true, data: forecasts }
   } catch (error) {
@@ -202,8 +217,22 @@ export async function analyzeSeasonality(formData: FormData) {
 
     const parsed = SeasonalityAnalysisSchema.parse(Object.fromEntries(formData))
 
+    const { data: profile } = await supabase
+      .from('user_profiles')
+      .select('organization_id')
+      .eq('user_id', user.id)
+      .single()
+
+    if (!profile?.organization_id) {
+      return { error: 'User profile not found' }
+    }
+
     const analytics = new PredictiveAnalytics(supabase)
-    const analyses = await analytics.analyzeSeasonality(parsed.productIds)
+    const analyses = await getCachedSeasonality(
+      analytics,
+      profile.organization_id,
+      parsed.productIds
+    )
 
     return { success: true, data: analyses }
   } catch (error) {
@@ -226,11 +255,21 @@ export async function getPredictiveMetrics() {
       return { error: 'Authentication required' }
     }
 
+    const { data: profile } = await supabase
+      .from('user_profiles')
+      .select('organization_id')
+      .eq('user_id', user.id)
+      .single()
+
+    if (!profile?.organization_id) {
+      return { error: 'User profile not found' }
+    }
+
     // Get organization products
     const { data: products } = await supabase
       .from('products')
       .select('id')
-      .eq('organization_id', user.organization_id)
+      .eq('organization_id', profile.organization_id)
 
     if (!products || products.length === 0) {
       return { error: 'No products found' }
@@ -239,13 +278,23 @@ export async function getPredictiveMetrics() {
     const productIds = products.map((p) => p.id)
     const analytics = new PredictiveAnalytics(supabase)
 
-    // Generate various predictions
-    const [demandForecasts, priceOptimizations, churnPredictions] =
-      await Promise.all([
-        analytics.generateDemandForecast(productIds.slice(0, 10)), // Limit for performance
-        analytics.optimizePricing(productIds.slice(0, 10)),
-        analytics.predictChurnRisk([]), // Will be populated with customer IDs
-      ])
+    // Generate various predictions; seasonality does not depend on the
+    // others, so it runs alongside them
+    const [
+      demandForecasts,
+      priceOptimizations,
+      churnPredictions,
+      seasonalityAnalyses,
+    ] = await Promise.all([
+      analytics.generateDemandForecast(productIds.slice(0, 10)), // Limit for performance
+      analytics.optimizePricing(productIds.slice(0, 10)),
+      analytics.predictChurnRisk([]), // Will be populated with customer IDs
+      getCachedSeasonality(
+        analytics,
+        profile.organization_id,
+        productIds.slice(0, 10)
+      ),
+    ])
 
     // Calculate aggregate metrics
     const demandForecast =
@@ -280,9 +329,6 @@ export async function getPredictiveMetrics() {
         : 0
 
     // Calculate seasonality score
-    const seasonalityAnalyses = await analytics.analyzeSeasonality(
-      productIds.slice(0, 10)
-    )
     const seasonalityScore =
       seasonalityAnalyses.length > 0
         ? seasonalityAnalyses.reduce((sum, s) => sum + s.seasonalityScore, 0) /
@@ -335,6 +381,8 @@ export async function getBusinessInsights() {
       .eq('organization_id', user.organization_id)
       .order('current_price', { ascending: false })
       .limit(5)
+      // Only the first order item is read below
+      .limit(1, { referencedTable: 'order_items' })
 
     // Get customer segments
     const { data: customerSegments } = await supabase
@@ -347,6 +395,8 @@ export async function getBusinessInsights() {
       `
       )
       .eq('organization_id', user.organization_id)
+      // Only the first order is read below
+      .limit(1, { referencedTable: 'orders' })
 
     // Generate insights
     const insights = {
@@ -12,6 +12,13 @@ import type {
   ReorderSuggestion,
 } from '@/types/ai.types'
 
+// Request-scoped client; generateInsights shares its own with the helpers
+// below so a single action does not build a client per helper
+type ServerClient = ReturnType<typeof createClient>
+
+// Forecast RPCs in flight at once per request
+const FORECAST_CONCURRENCY = 4
+
 export async function generateInsights(organizationId: string) {
   const supabase = createClient()
   const auditLogger = new AuditLogger()
@@ -24,9 +31,9 @@ export async function generateInsights(organizationId: string) {
   try {
     // Generate different types of insights
     const [anomalies, reorderSuggestions, forecastData] = await Promise.all([
-      detectAnomalies(organizationId),
-      generateReorderSuggestions(organizationId),
-      generateDemandForecasts(organizationId),
+      detectAnomaliesWithClient(supabase, organizationId),
+      generateReorderSuggestionsWithClient(supabase, organizationId),
+      generateDemandForecastsWithClient(supabase, organizationId),
     ])
 
     // Store insights in the database
@@ -140,8 +147,23 @@ export async function generateInsights(organizationId: string) {
 }
 
 export async function detectAnomalies(organizationId: string) {
-  const supabase = createClient()
+  return detectAnomaliesWithClient(createClient(), organizationId)
+}
+
+export async function generateReorderSuggestions(organizationId: string) {
+  return generateReorderSuggestionsWithClient(createClient(), organizationId)
+}
+
+export async function generateDemandForecasts(organizationId: string) {
+  return generateDemandForecastsWithClient(createClient(), organizationId)
+}
 
+// The client-taking helpers stay unexported: every export of a 'use server'
+// module is a callable action, and the client must not come from the caller
+async function detectAnomaliesWithClient(
+  supabase: ServerClient,
+  organizationId: string
+) {
   try {
     const { data, error } = await supabase.rpc('detect_inventory_anomalies', {
       p_organization_id: organizationId,
@@ -156,9 +178,10 @@ export async function detectAnomalies(organizationId: string) {
   }
 }
 
-export async function generateReorderSuggestions(organizationId: string) {
-  const supabase = createClient()
-
+async function generateReorderSuggestionsWithClient(
+  supabase: ServerClient,
+  organizationId: string
+) {
   try {
     const { data, error } = await supabase.rpc('generate_reorder_suggestions', {
       p_organization_id: organizationId,
@@ -173,9 +196,10 @@ export async function generateReorderSuggestions(organizationId: string) {
   }
 }
 
-export async function generateDemandForecasts(organizationId: string) {
-  const supabase = createClient()
-
+async function generateDemandForecastsWithClient(
+  supabase: ServerClient,
+  organizationId: string
+) {
   try {
     // Get top products by recent activity
     const { data: topProducts, error: productsError } = await supabase
@@ -195,11 +219,21 @@ export async function generateDemandForecasts(organizationId: string) {
 
     if (productsError) throw productsError
 
-    const forecasts = []
+    const items = topProducts || []
+    const results: any[] = new Array(items.length)
+    // Failures are reported once per run rather than once per product
+    const failedProductIds: string[] = []
+    let firstError: unknown
+    const processing = new Set<Promise<void>>()
+
+    // Generate forecasts for each product, a few RPCs at a time
+    for (const [i, item] of items.entries()) {
+      // Wait if too many concurrent forecasts
+      while (processing.size >= FORECAST_CONCURRENCY) {
+        await Promise.race(processing)
+      }
 
-    // Generate forecasts for each product
-    for (const item of topProducts || []) {
-      try {
+      const promise = (async () => {
         const { data: forecast, error: forecastError } = await supabase.rpc(
           'calculate_moving_average_forecast',
           {
@@ -210,8 +244,10 @@ export async function generateDemandForecasts(organizationId: string) {
           }
         )
 
-        if (!forecastError && forecast) {
-          forecasts.push({
+        if (forecastError) throw forecastError
+
+        if (forecast) {
+          results[i] = {
             productId: item.product_id,
             warehouseId: item.warehouse_id,
             productName: item.products.name,
@@ -220,14 +256,30 @@ export async function generateDemandForecasts(organizationId: string) {
             confidence: 0.7, // Simple moving average has moderate confidence
             method: 'moving_average',
             generatedAt: new Date(),
-          })
+          }
         }
-      } catch (err) {
-        console.error(
-          `Error generating forecast for product ${item.product_id}:`,
-          err
-        )
-      }
+      })()
+        .catch((err) => {
+          if (failedProductIds.length === 0) firstError = err
+          failedProductIds.push(item.product_id)
+        })
+        .finally(() => {
+          processing.delete(promise)
+        })
+
+      processing.add(promise)
+    }
+
+    // Wait for all forecasts to complete
+    await Promise.all(processing)
+    const forecasts = results.filter(Boolean)
+
+    if (failedProductIds.length > 0) {
+      console.error(
+        `Error generating forecasts for ${failedProductIds.length} products:`,
+        failedProductIds,
+        firstError
+      )
     }
 
     return { success: true, data: forecasts }
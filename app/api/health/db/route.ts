@@ -0,0 +1,46 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabase/admin'
+
+// Fail the probe rather than hang when the database stops answering
+const DB_CHECK_TIMEOUT_MS = 5000
+
+export async function GET() {
+  const startTime = Date.now()
+  let timer: ReturnType<typeof setTimeout> | undefined
+
+  try {
+    // Cheapest round trip through PostgREST to Postgres: no rows returned
+    const { error } = await Promise.race([
+      supabaseAdmin
+        .from('organizations')
+        .select('id', { head: true })
+        .limit(1),
+      new Promise<never>((_, reject) => {
+        timer = setTimeout(
+          () => reject(new Error('Database check timed out')),
+          DB_CHECK_TIMEOUT_MS
+        )
+      }),
+    ])
+
+    if (error) throw error
+
+    return NextResponse.json({
+      status: 'ok',
+      latencyMs: Date.now() - startTime,
+      timestamp: new Date().toISOString(),
+    })
+  } catch (error) {
+    console.error('Database health check failed:', error)
+    return NextResponse.json(
+      {
+        status: 'error',
+        latencyMs: Date.now() - startTime,
+        timestamp: new Date().toISOString(),
+      },
+      { status: 503 }
+    )
+  } finally {
+    clearTimeout(timer)
+  }
+}
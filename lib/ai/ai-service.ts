@@ -16,21 +16,15 @@ export class AIService {
 
   async generateInsights(
     organizationId: string,
-    dateRange: { from: Date; to: Date }
+    _dateRange: { from: Date; to: Date }
   ): Promise<{
     summary: string
     recommendations: string[]
     alerts: AnomalyAlert[]
   }> {
-    // Fetch relevant data
-    const [inventory, orders, pricing] = await Promise.all([
-      this.getInventoryData(organizationId, dateRange),
-      this.getOrderData(organizationId, dateRange),
-      this.getPricingData(organizationId, dateRange),
-    ])
-
-    // Generate insights using AI (simplified for now)
-    const insights = this.generateMockInsights(inventory, orders, pricing)
+    // Generate insights using AI (simplified for now). The mock reads no
+    // organization data, so nothing is fetched until a model consumes it
+    const insights = this.generateMockInsights()
 
     // Store insights
     await this.storeInsights(organizationId, insights)
@@ -44,14 +38,17 @@ export class AIService {
     organizationId: string,
     horizonDays: number = 30
   ): Promise<DemandForecast> {
-    // Get historical data
-    const historicalData = await this.getHistoricalDemand(
-      productId,
-      warehouseId
-    )
+    // Get historical demand totals
+    const history = await this.getHistoricalDemand(productId, warehouseId)
+
+    // Without history there is nothing to forecast; fail rather than store a
+    // made-up baseline as a prediction
+    if (history.orderCount === 0) {
+      throw new Error(`No demand history for product ${productId}`)
+    }
 
     // Generate forecast (simplified)
-    const forecast = this.generateMockForecast(historicalData, horizonDays)
+    const forecast = this.generateMockForecast(history, horizonDays)
 
     // Store prediction
     await this.storePrediction({
@@ -165,86 +162,26 @@ export class AIService {
     organizationId: string,
     scope: 'all' | 'inventory' | 'orders' | 'pricing' = 'all'
   ): Promise<AnomalyAlert[]> {
-    const anomalies: AnomalyAlert[] = []
+    // Run the requested detectors concurrently; they query independent tables
+    const detections: Promise<AnomalyAlert[]>[] = []
 
     if (scope === 'all' || scope === 'inventory') {
-      const inventoryAnomalies = await this.detectInventoryAnomalies(organizationId)
-      anomalies.push(...inventoryAnomalies)
+      detections.push(this.detectInventoryAnomalies(organizationId))
     }
 
     if (scope === 'all' || scope === 'orders') {
-      const orderAnomalies = await this.detectOrderAnomalies(organizationId)
-      anomalies.push(...orderAnomalies)
+      detections.push(this.detectOrderAnomalies(organizationId))
     }
 
     if (scope === 'all' || scope === 'pricing') {
-      const pricingAnomalies = await this.detectPricingAnomalies(organizationId)
-      anomalies.push(...pricingAnomalies)
+      detections.push(this.detectPricingAnomalies(organizationId))
     }
 
-    return anomalies
+    const results = await Promise.all(detections)
+    return results.flat()
   }
 
-  private async getInventoryData(
-    organizationId: string,
-    dateRange: { from: Date; to: Date }
-  ) {
-    const { data } = await this.supabase
-      .from('inventory')
-      .select('*')
-      .eq('organization_id', organizationId)
-
-    return {
-      summary: {
-        totalProducts: data?.length || 0,
-        lowStockItems: data?.filter((i) => i.quantity < 10).length || 0,
-        totalValue: data?.reduce((sum, i) => sum + (i.value || 0), 0) || 0,
-      },
-      data,
-    }
-  }
-
-  private async getOrderData(
-    organizationId: string,
-    dateRange: { from: Date; to: Date }
-  ) {
-    const { data } = await this.supabase
-      .from('orders')
-      .select('*')
-      .eq('organization_id', organizationId)
-      .gte('created_at', dateRange.from.toISOString())
-      .lte('created_at', dateRange.to.toISOString())
-
-    const patterns = {
-      totalOrders: data?.length || 0,
-      averageOrderValue: data?.length
-        ? data.reduce((sum, o) => sum + (o.total || 0), 0) / data.length
-        : 0,
-      peakDays: this.identifyPeakDays(data || []),
-    }
-
-    return { patterns, data }
-  }
-
-  private async getPricingData(
-    organizationId: string,
-    dateRange: { from: Date; to: Date }
-  ) {
-    const { data } = await this.supabase
-      .from('products')
-      .select('*')
-      .eq('organization_id', organizationId)
-
-    return {
-      overview: {
-        priceChanges: 0, // Would track price changes
-        averageMargin: this.calculateAverageMargin(data || []),
-      },
-      data,
-    }
-  }
-
-  private generateMockInsights(inventory: any, orders: any, pricing: any) {
+  private generateMockInsights() {
     return {
       summary: 'Your inventory accuracy improved by 2.3% this week. Low stock alerts decreased by 15%.',
       recommendations: [
@@ -268,26 +205,37 @@ export class AIService {
     }
   }
 
+  // The forecast only needs the row count and total quantity, so reduce the
+  // rows here instead of handing the raw history around
   private async getHistoricalDemand(
     productId: string,
     warehouseId: string
-  ): Promise<any[]> {
-    const { data } = await this.supabase
+  ): Promise<{ orderCount: number; totalQuantity: number }> {
+    const { data, error } = await this.supabase
       .from('order_items')
-      .select('quantity, created_at')
+      .select('quantity')
       .eq('product_id', productId)
       .gte(
         'created_at',
         new Date(Date.now() - 90 * 24 * 60 * 60 * 1000).toISOString()
       )
 
-    return data || []
+    // Surface lookup failures so an empty history only ever means no sales
+    if (error) throw error
+
+    let totalQuantity = 0
+    for (const item of data || []) {
+      totalQuantity += item.quantity || 0
+    }
+
+    return { orderCount: data?.length || 0, totalQuantity }
   }
 
-  private generateMockForecast(historicalData: any[], horizonDays: number) {
-    const avgDemand = historicalData.length > 0
-      ? historicalData.reduce((sum, item) => sum + item.quantity, 0) / historicalData.length
-      : 10
+  private generateMockForecast(
+    history: { orderCount: number; totalQuantity: number },
+    horizonDays: number
+  ) {
+    const avgDemand = history.totalQuantity / history.orderCount
 
     const predictions = Array.from({ length: horizonDays }, (_, i) =>
       Math.round(avgDemand * (1 + Math.sin(i / 7) * 0.2)) // Add some seasonality
@@ -299,17 +247,6 @@ export class AIService {
     }
   }
 
-  private identifyPeakDays(orders: any[]): string[] {
-    // Mock implementation
-    return ['Monday', 'Wednesday', 'Friday']
-  }
-
-  private calculateAverageMargin(products: any[]): number {
-    if (!products.length) return 0
-    const margins = products.map(p => (p.price - p.unit_cost) / p.price)
-    return margins.reduce((sum, margin) => sum + margin, 0) / margins.length
-  }
-
   private async detectInventoryAnomalies(organizationId: string): Promise<AnomalyAlert[]> {
     const { data: inventory } = await this.supabase
       .from('inventory')
@@ -317,6 +254,7 @@ export class AIService {
       .eq('organization_id', organizationId)
 
     const anomalies: AnomalyAlert[] = []
+    const detectedAt = new Date()
 
     if (inventory) {
       for (const item of inventory) {
@@ -328,7 +266,7 @@ export class AIService {
             severity: 'critical',
             title: 'Product Out of Stock',
             description: `${item.products.name} is completely out of stock`,
-            detectedAt: new Date(),
+            detectedAt,
             confidence: 1.0,
             relatedEntities: [
               {
@@ -353,7 +291,7 @@ export class AIService {
             severity: 'warning',
             title: 'Low Stock Alert',
             description: `${item.products.name} has only ${item.quantity} units remaining`,
-            detectedAt: new Date(),
+            detectedAt,
             confidence: 0.9,
             relatedEntities: [
               {
@@ -376,28 +314,30 @@ export class AIService {
   }
 
   private async detectOrderAnomalies(organizationId: string): Promise<AnomalyAlert[]> {
-    const { data: recentOrders } = await this.supabase
+    // Only large orders are reported, so filter them in the database rather
+    // than downloading every order from the last day
+    const { data: largeOrders } = await this.supabase
       .from('orders')
-      .select('*')
+      .select('id, order_number, total_amount')
       .eq('organization_id', organizationId)
       .gte(
         'created_at',
         new Date(Date.now() - 24 * 60 * 60 * 1000).toISOString()
       )
+      .gt('total_amount', 10000)
 
     const anomalies: AnomalyAlert[] = []
+    const detectedAt = new Date()
 
-    if (recentOrders) {
-      // Detect large orders
-      const largeOrders = recentOrders.filter((o) => o.total > 10000)
+    if (largeOrders) {
       for (const order of largeOrders) {
         anomalies.push({
           id: `large-order-${order.id}`,
           type: 'large_order',
           severity: 'info',
           title: 'Large Order Detected',
-          description: `Order #${order.order_number} for $${order.total.toLocaleString()}`,
-          detectedAt: new Date(),
+          description: `Order #${order.order_number} for $${order.total_amount.toLocaleString()}`,
+          detectedAt,
           confidence: 1.0,
           relatedEntities: [
             {
@@ -470,21 +410,24 @@ export class AIService {
   }
 
   private async storePrediction(prediction: any): Promise<void> {
+    const now = Date.now()
+    const today = new Date(now).toISOString().split('T')[0]
+
     await this.supabase.from('ai_predictions').insert({
       organization_id: prediction.organizationId,
       prediction_type: 'demand',
       entity_type: 'product',
       entity_id: prediction.productId,
-      prediction_date: new Date().toISOString().split('T')[0],
+      prediction_date: today,
       prediction_value: {
         forecast: prediction.forecast.predictions,
         horizonDays: prediction.horizonDays,
       },
       confidence_score: prediction.forecast.confidence,
       model_version: '1.0.0',
-      prediction_start: new Date().toISOString().split('T')[0],
+      prediction_start: today,
       prediction_end: new Date(
-        Date.now() + prediction.horizonDays * 24 * 60 * 60 * 1000
+        now + prediction.horizonDays * 24 * 60 * 60 * 1000
       )
         .toISOString()
         .split('T')[0],
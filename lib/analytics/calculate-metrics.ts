@@ -36,6 +36,37 @@ export interface RevenueImpactMetrics {
   accuracyImprovement: number
 }
 
+// Running per-day sums while grouping sync records
+interface SyncPerformanceTotals {
+  count: number
+  totalDuration: number
+  completedCount: number
+}
+
+function getSyncTotals(
+  totalsByDate: Map<string, SyncPerformanceTotals>,
+  date: string
+): SyncPerformanceTotals {
+  let totals = totalsByDate.get(date)
+  if (!totals) {
+    totals = { count: 0, totalDuration: 0, completedCount: 0 }
+    totalsByDate.set(date, totals)
+  }
+  return totals
+}
+
+function toSyncPerformanceMetrics(
+  totalsByDate: Map<string, SyncPerformanceTotals>
+): SyncPerformanceMetrics[] {
+  return Array.from(totalsByDate, ([date, totals]) => ({
+    date,
+    syncCount: totals.count,
+    avgDuration: totals.count > 0 ? totals.totalDuration / totals.count : 0,
+    successRate:
+      totals.count > 0 ? (totals.completedCount / totals.count) * 100 : 0,
+  }))
+}
+
 export class AnalyticsCalculator {
   private supabase: ReturnType<typeof createServerClient>
 
@@ -123,101 +154,49 @@ export class AnalyticsCalculator {
 
       if (jobsError) throw jobsError
 
-      // Convert sync jobs to performance metrics format
-      const metricsByDate = new Map<string, SyncPerformanceMetrics>()
+      // Convert sync jobs to performance metrics format, parsing each job's
+      // timestamps once while accumulating its day's totals
+      const totalsByDate = new Map<string, SyncPerformanceTotals>()
 
       syncJobs.forEach((job) => {
-        const date = format(new Date(job.created_at), 'yyyy-MM-dd')
-
-        if (!metricsByDate.has(date)) {
-          metricsByDate.set(date, {
-            date,
-            syncCount: 0,
-            avgDuration: 0,
-            successRate: 0,
-          })
-        }
-
-        const metrics = metricsByDate.get(date)!
-        metrics.syncCount++
-      })
-
-      // Calculate aggregated metrics
-      metricsByDate.forEach((metrics, date) => {
-        const jobsForDate = syncJobs.filter(
-          (job) => format(new Date(job.created_at), 'yyyy-MM-dd') === date
+        const createdAt = new Date(job.created_at)
+        const totals = getSyncTotals(
+          totalsByDate,
+          format(createdAt, 'yyyy-MM-dd')
         )
 
-        let totalDuration = 0
-        let completedCount = 0
-
-        jobsForDate.forEach((job) => {
-          if (job.updated_at && job.created_at) {
-            const duration =
-              new Date(job.updated_at).getTime() -
-              new Date(job.created_at).getTime()
-            totalDuration += duration
-          }
-          if (job.status === 'completed') {
-            completedCount++
-          }
-        })
-
-        metrics.avgDuration =
-          jobsForDate.length > 0 ? totalDuration / jobsForDate.length : 0
-        metrics.successRate =
-          jobsForDate.length > 0
-            ? (completedCount / jobsForDate.length) * 100
-            : 0
+        totals.count++
+        if (job.updated_at && job.created_at) {
+          totals.totalDuration +=
+            new Date(job.updated_at).getTime() - createdAt.getTime()
+        }
+        if (job.status === 'completed') {
+          totals.completedCount++
+        }
       })
 
-      return Array.from(metricsByDate.values())
+      return toSyncPerformanceMetrics(totalsByDate)
     }
 
     // Process actual sync performance logs
-    const metricsByDate = new Map<string, SyncPerformanceMetrics>()
+    const totalsByDate = new Map<string, SyncPerformanceTotals>()
 
     syncLogs.forEach((log) => {
-      const date = format(new Date(log.started_at), 'yyyy-MM-dd')
-
-      if (!metricsByDate.has(date)) {
-        metricsByDate.set(date, {
-          date,
-          syncCount: 0,
-          avgDuration: 0,
-          successRate: 0,
-        })
-      }
-
-      const metrics = metricsByDate.get(date)!
-      metrics.syncCount++
-    })
-
-    // Calculate aggregated metrics for each date
-    metricsByDate.forEach((metrics, date) => {
-      const logsForDate = syncLogs.filter(
-        (log) => format(new Date(log.started_at), 'yyyy-MM-dd') === date
+      const totals = getSyncTotals(
+        totalsByDate,
+        format(new Date(log.started_at), 'yyyy-MM-dd')
       )
 
-      let totalDuration = 0
-      let completedCount = 0
-
-      logsForDate.forEach((log) => {
-        if (log.duration_ms) {
-          totalDuration += log.duration_ms
-        }
-        if (log.status === 'completed') {
-          completedCount++
-        }
-      })
-
-      metrics.avgDuration =
-        logsForDate.length > 0 ? totalDuration / logsForDate.length : 0
-      metrics.successRate =
-        logsForDate.length > 0 ? (completedCount / logsForDate.length) * 100 : 0
+      totals.count++
+      if (log.duration_ms) {
+        totals.totalDuration += log.duration_ms
+      }
+      if (log.status === 'completed') {
+        totals.completedCount++
+      }
     })
 
-    return Array.from(metricsByDate.values())
+    return toSyncPerformanceMetrics(totalsByDate)
   }
 
   async calculateInventoryTrends(
@@ -46,7 +46,149 @@ export interface SeasonalityAnalysis {
   seasonalFactors: Record<string, number>
 }
 
+const MONTH_NAMES: readonly string[] = Object.freeze([
+  'January',
+  'February',
+  'March',
+  'April',
+  'May',
+  'June',
+  'July',
+  'August',
+  'September',
+  'October',
+  'November',
+  'December',
+])
+
+// Table and numeric column analysed for each anomaly data type
+const ANOMALY_SOURCES: Record<
+  AnomalyDetection['type'],
+  { table: string; column: string }
+> = {
+  price: { table: 'order_items', column: 'unit_price' },
+  demand: { table: 'order_items', column: 'quantity' },
+  inventory: { table: 'inventory', column: 'quantity' },
+  revenue: { table: 'orders', column: 'total_amount' },
+}
+
+interface Moments {
+  mean: number
+  stdDev: number
+}
+
+/**
+ * Compute mean and population standard deviation in one pass
+ */
+function computeMoments(values: ArrayLike<number>): Moments {
+  const n = values.length
+  if (n === 0) return { mean: 0, stdDev: 0 }
+
+  let sum = 0
+  let sumSq = 0
+
+  for (let i = 0; i < n; i++) {
+    const value = values[i] as number
+    sum += value
+    sumSq += value * value
+  }
+
+  const mean = sum / n
+  // Clamp to zero so rounding on near-constant series cannot go negative
+  const variance = Math.max(0, sumSq / n - mean * mean)
+
+  return { mean, stdDev: Math.sqrt(variance) }
+}
+
+/**
+ * Running demand statistics for one product. Sales are folded in as they
+ * are fetched, so the raw history never has to be held in memory
+ */
+interface DemandHistory {
+  count: number
+  total: number
+  // Sum of the oldest ten sales and a ring buffer of the newest ten
+  olderTotal: number
+  recent: Float64Array
+  // Per calendar month, index 0 = January
+  monthlyTotals: Float64Array
+  monthlyCounts: Uint32Array
+}
+
+function createDemandHistory(): DemandHistory {
+  return {
+    count: 0,
+    total: 0,
+    olderTotal: 0,
+    recent: new Float64Array(10),
+    monthlyTotals: new Float64Array(12),
+    monthlyCounts: new Uint32Array(12),
+  }
+}
+
+/**
+ * Zero-based calendar month of a PostgREST timestamp. Supabase returns
+ * `YYYY-MM-DDTHH:MM:SS...+00:00`, so the month is read straight from the
+ * string; anything else goes through Date parsing
+ */
+function monthOf(timestamp: string): number {
+  if (timestamp[4] === '-' && timestamp[7] === '-') {
+    const month = Number(timestamp.slice(5, 7)) - 1
+    if (month >= 0 && month < 12) return month
+  }
+  return new Date(timestamp).getUTCMonth()
+}
+
+/**
+ * Fold one sale into the history; sales must arrive in created_at order
+ */
+function addDemandSample(
+  history: DemandHistory,
+  quantity: number,
+  createdAt: string
+): void {
+  if (history.count < 10) history.olderTotal += quantity
+  history.recent[history.count % 10] = quantity
+  history.count++
+  history.total += quantity
+
+  const month = monthOf(createdAt)
+  const { monthlyTotals, monthlyCounts } = history
+  monthlyTotals[month] = (monthlyTotals[month] as number) + quantity
+  monthlyCounts[month] = (monthlyCounts[month] as number) + 1
+}
+
+/**
+ * Average quantity per calendar month; months without sales average to zero
+ */
+function monthlyAverages(history: DemandHistory): Float64Array {
+  const averages = new Float64Array(12)
+  for (let month = 0; month < 12; month++) {
+    const count = history.monthlyCounts[month] as number
+    averages[month] =
+      count > 0 ? (history.monthlyTotals[month] as number) / count : 0
+  }
+  return averages
+}
+
 export class PredictiveAnalytics {
+  // Statistical anomaly threshold, in standard deviations
+  private readonly Z_SCORE_THRESHOLD = 2
+
+  // Rows requested per page when scanning a time range
+  private readonly PAGE_SIZE = 1000
+
+  // Product ids per `in` filter, keeping request URLs well under limits
+  private readonly PRODUCT_BATCH_SIZE = 200
+
+  // Precomputed forecasts are refreshed nightly; the slack covers the
+  // time the next run takes to reach each organization
+  private readonly STORED_FORECAST_TTL_MS = 26 * 60 * 60 * 1000
+  private readonly FORECAST_MODEL_VERSION = 'predictive-analytics-1.0.0'
+  // Kept apart from AIService's on-demand 'demand' rows so neither writer
+  // replaces or collides with the other's daily row
+  private readonly STORED_FORECAST_TYPE = 'demand_forecast'
+
   constructor(private supabase: any) {}
 
   /**
@@ -57,37 +199,133 @@ export class PredictiveAnalytics {
     forecastPeriod: number = 30
   ): Promise<DemandForecast[]> {
     try {
-      const forecasts: DemandForecast[] = []
+      return await this.computeDemandForecasts(productIds, forecastPeriod)
+    } catch (error) {
+      console.error('Error generating demand forecast:', error)
+      return []
+    }
+  }
 
-      for (const productId of productIds) {
-        // Get historical sales data
-        const { data: salesData } = await this.supabase
-          .from('order_items')
-          .select('quantity, created_at, unit_price')
-          .eq('product_id', productId)
-          .gte(
-            'created_at',
-            new Date(Date.now() - 365 * 24 * 60 * 60 * 1000).toISOString()
-          )
-          .order('created_at', { ascending: true })
-
-        if (!salesData || salesData.length === 0) {
-          continue
-        }
+  /**
+   * Generate demand forecasts, letting history lookup failures propagate
+   * for callers that need to tell them apart from products without sales
+   */
+  async computeDemandForecasts(
+    productIds: string[],
+    forecastPeriod: number = 30
+  ): Promise<DemandForecast[]> {
+    if (productIds.length === 0) return []
 
-        // Calculate demand forecast using time series analysis
-        const forecast = this.calculateDemandForecast(salesData, forecastPeriod)
-        forecasts.push({
-          productId,
-          ...forecast,
-        })
+    // Summarize historical sales for all products in batched queries
+    const historyByProduct = await this.fetchDemandHistory(
+      productIds,
+      new Date(Date.now() - 365 * 24 * 60 * 60 * 1000)
+    )
+
+    const forecasts: DemandForecast[] = []
+
+    for (const productId of productIds) {
+      const history = historyByProduct.get(productId)
+      if (!history || history.count === 0) {
+        continue
       }
 
-      return forecasts
-    } catch (error) {
-      console.error('Error generating demand forecast:', error)
-      return []
+      // Calculate demand forecast using time series analysis
+      const forecast = this.calculateDemandForecast(history, forecastPeriod)
+      forecasts.push({
+        productId,
+        ...forecast,
+      })
     }
+
+    return forecasts
+  }
+
+  /**
+   * Serve demand forecasts from the nightly precomputed set where fresh,
+   * computing only the remaining products live
+   */
+  async getDemandForecasts(
+    organizationId: string,
+    productIds: string[],
+    forecastPeriod: number = 30
+  ): Promise<DemandForecast[]> {
+    const stored = await this.getStoredDemandForecasts(
+      organizationId,
+      productIds,
+      forecastPeriod
+    )
+
+    const missing = productIds.filter((productId) => !stored.has(productId))
+    const live = await this.generateDemandForecast(missing, forecastPeriod)
+    for (const forecast of live) {
+      stored.set(forecast.productId, forecast)
+    }
+
+    const forecasts: DemandForecast[] = []
+    for (const productId of productIds) {
+      const forecast = stored.get(productId)
+      if (forecast) forecasts.push(forecast)
+    }
+
+    return forecasts
+  }
+
+  /**
+   * Persist forecasts for the nightly precompute so later requests can be
+   * served without recomputing them
+   */
+  async storeDemandForecasts(
+    organizationId: string,
+    forecasts: DemandForecast[],
+    forecastPeriod: number = 30
+  ): Promise<void> {
+    if (forecasts.length === 0) return
+
+    const now = Date.now()
+    const today = new Date(now).toISOString().split('T')[0]
+    const periodEnd = new Date(now + forecastPeriod * 24 * 60 * 60 * 1000)
+      .toISOString()
+      .split('T')[0]
+    const expiresAt = new Date(now + this.STORED_FORECAST_TTL_MS).toISOString()
+
+    const { error } = await this.supabase.from('ai_predictions').upsert(
+      forecasts.map(({ productId, ...forecast }) => ({
+        organization_id: organizationId,
+        prediction_type: this.STORED_FORECAST_TYPE,
+        entity_type: 'product',
+        entity_id: productId,
+        prediction_date: today,
+        prediction_value: { forecastPeriod, ...forecast },
+        confidence_score: forecast.confidence / 100,
+        model_version: this.FORECAST_MODEL_VERSION,
+        prediction_start: today,
+        prediction_end: periodEnd,
+        expires_at: expiresAt,
+      })),
+      {
+        onConflict:
+          'organization_id,prediction_type,entity_type,entity_id,prediction_date',
+      }
+    )
+
+    if (error) throw error
+  }
+
+  /**
+   * Delete the organization's expired precomputed forecasts. Every nightly
+   * run adds a row per product and day, so without pruning the table grows
+   * without bound and lookups skip ever more dead rows
+   */
+  async pruneExpiredDemandForecasts(organizationId: string): Promise<void> {
+    const { error } = await this.supabase
+      .from('ai_predictions')
+      .delete()
+      .eq('organization_id', organizationId)
+      .eq('prediction_type', this.STORED_FORECAST_TYPE)
+      .lt('expires_at', new Date().toISOString())
+
+    if (error) throw error
   }
 
   /**
@@ -98,21 +336,22 @@ export class PredictiveAnalytics {
       const optimizations: PriceOptimization[] = []
 
       for (const productId of productIds) {
-        // Get pricing and sales data
-        const { data: pricingData } = await this.supabase
-          .from('products')
-          .select('base_price, current_price')
-          .eq('id', productId)
-          .single()
-
-        const { data: salesData } = await this.supabase
-          .from('order_items')
-          .select('quantity, unit_price, created_at')
-          .eq('product_id', productId)
-          .gte(
-            'created_at',
-            new Date(Date.now() - 90 * 24 * 60 * 60 * 1000).toISOString()
-          )
+        // Get pricing and sales data concurrently; the queries are independent
+        const [{ data: pricingData }, { data: salesData }] = await Promise.all([
+          this.supabase
+            .from('products')
+            .select('base_price, current_price')
+            .eq('id', productId)
+            .single(),
+          this.supabase
+            .from('order_items')
+            .select('quantity, unit_price')
+            .eq('product_id', productId)
+            .gte(
+              'created_at',
+              new Date(Date.now() - 90 * 24 * 60 * 60 * 1000).toISOString()
+            ),
+        ])
 
         if (!pricingData || !salesData) {
           continue
@@ -144,18 +383,20 @@ export class PredictiveAnalytics {
       const predictions: ChurnPrediction[] = []
 
       for (const customerId of customerIds) {
-        // Get customer behavior data
-        const { data: customerData } = await this.supabase
-          .from('customers')
-          .select('*')
-          .eq('id', customerId)
-          .single()
-
-        const { data: orderData } = await this.supabase
-          .from('orders')
-          .select('total_amount, created_at, status')
-          .eq('customer_id', customerId)
-          .order('created_at', { ascending: false })
+        // Get customer behavior data concurrently
+        const [{ data: customerData }, { data: orderData }] =
+          await Promise.all([
+            this.supabase
+              .from('customers')
+              .select('*')
+              .eq('id', customerId)
+              .single(),
+            this.supabase
+              .from('orders')
+              .select('total_amount, created_at, status')
+              .eq('customer_id', customerId)
+              .order('created_at', { ascending: false }),
+          ])
 
         if (!customerData || !orderData) {
           continue
@@ -183,35 +424,18 @@ export class PredictiveAnalytics {
     dataType: 'price' | 'demand' | 'inventory' | 'revenue',
     timeRange: { start: Date; end: Date }
   ): Promise<AnomalyDetection[]> {
+    // Only the fetch can fail; the statistics below are pure and already
+    // return early for empty or constant series
+    let values: Float64Array
     try {
-      const anomalies: AnomalyDetection[] = []
-
-      // Get relevant data based on type
-      let data: any[] = []
-      switch (dataType) {
-        case 'price':
-          data = await this.getPriceData(timeRange)
-          break
-        case 'demand':
-          data = await this.getDemandData(timeRange)
-          break
-        case 'inventory':
-          data = await this.getInventoryData(timeRange)
-          break
-        case 'revenue':
-          data = await this.getRevenueData(timeRange)
-          break
-      }
-
-      // Detect anomalies using statistical methods
-      const detectedAnomalies = this.detectStatisticalAnomalies(data, dataType)
-      anomalies.push(...detectedAnomalies)
-
-      return anomalies
+      values = await this.fetchValueColumn(dataType, timeRange)
     } catch (error) {
       console.error('Error detecting anomalies:', error)
       return []
     }
+
+    // Detect anomalies using statistical methods
+    return this.detectStatisticalAnomalies(values, dataType)
   }
 
   /**
@@ -221,26 +445,42 @@ export class PredictiveAnalytics {
     productIds: string[]
   ): Promise<SeasonalityAnalysis[]> {
     try {
+      if (productIds.length === 0) return []
+
+      // Aggregate the past 2 years into per-product monthly averages in the
+      // database rather than downloading every order item
+      const { data: monthlyDemand, error } = await this.supabase.rpc(
+        'get_monthly_demand',
+        {
+          p_product_ids: productIds,
+          p_since: new Date(
+            Date.now() - 2 * 365 * 24 * 60 * 60 * 1000
+          ).toISOString(),
+        }
+      )
+
+      if (error) throw error
+
+      const averagesByProduct = new Map<string, Float64Array>()
+      for (const row of monthlyDemand || []) {
+        let averages = averagesByProduct.get(row.product_id)
+        if (!averages) {
+          averages = new Float64Array(12)
+          averagesByProduct.set(row.product_id, averages)
+        }
+        averages[row.month - 1] = Number(row.avg_quantity) || 0
+      }
+
       const analyses: SeasonalityAnalysis[] = []
 
       for (const productId of productIds) {
-        // Get historical data for the past 2 years
-        const { data: historicalData } = await this.supabase
-          .from('order_items')
-          .select('quantity, created_at')
-          .eq('product_id', productId)
-          .gte(
-            'created_at',
-            new Date(Date.now() - 2 * 365 * 24 * 60 * 60 * 1000).toISOString()
-          )
-          .order('created_at', { ascending: true })
-
-        if (!historicalData || historicalData.length === 0) {
+        const averages = averagesByProduct.get(productId)
+        if (!averages) {
           continue
         }
 
         // Calculate seasonality
-        const analysis = this.calculateSeasonality(historicalData)
+        const analysis = this.calculateSeasonality(averages)
         analyses.push({
           productId,
           ...analysis,
@@ -258,21 +498,21 @@ export class PredictiveAnalytics {
    * Calculate demand forecast using time series analysis
    */
   private calculateDemandForecast(
-    salesData: any[],
+    history: DemandHistory,
     forecastPeriod: number
   ): Omit<DemandForecast, 'productId'> {
     // Simple moving average for demonstration
     // In production, use more sophisticated algorithms like ARIMA, Prophet, etc.
 
-    const quantities = salesData.map((item) => item.quantity)
-    const avgDemand =
-      quantities.reduce((sum, qty) => sum + qty, 0) / quantities.length
+    const avgDemand = history.total / history.count
 
-    // Calculate trend
-    const recentAvg =
-      quantities.slice(-10).reduce((sum, qty) => sum + qty, 0) / 10
-    const olderAvg =
-      quantities.slice(0, 10).reduce((sum, qty) => sum + qty, 0) / 10
+    // Calculate trend from the oldest and newest ten sales
+    let recentTotal = 0
+    for (let i = 0; i < history.recent.length; i++) {
+      recentTotal += history.recent[i] as number
+    }
+    const recentAvg = recentTotal / 10
+    const olderAvg = history.olderTotal / 10
     const trend =
       recentAvg > olderAvg
         ? 'increasing'
@@ -281,7 +521,9 @@ export class PredictiveAnalytics {
           : 'stable'
 
     // Calculate seasonality (simplified)
-    const seasonality = this.calculateSeasonalityFactor(salesData)
+    const seasonality = this.calculateSeasonalityFactor(
+      monthlyAverages(history)
+    )
 
     // Predict future demand
     const predictedDemand =
@@ -307,13 +549,15 @@ export class PredictiveAnalytics {
     const currentPrice = pricingData.current_price || pricingData.base_price
     const basePrice = pricingData.base_price
 
-    // Calculate price elasticity
-    const priceChanges = salesData.map((item) => ({
-      price: item.unit_price,
-      quantity: item.quantity,
-    }))
+    // Calculate price elasticity over parallel price/quantity columns
+    const prices = new Float64Array(salesData.length)
+    const quantities = new Float64Array(salesData.length)
+    for (const [i, item] of salesData.entries()) {
+      prices[i] = item.unit_price
+      quantities[i] = item.quantity
+    }
 
-    const elasticity = this.calculatePriceElasticity(priceChanges)
+    const elasticity = this.calculatePriceElasticity(prices, quantities)
 
     // Calculate optimal price
     const optimalPrice = this.calculateOptimalPrice(currentPrice, elasticity)
@@ -392,38 +636,54 @@ export class PredictiveAnalytics {
    * Detect statistical anomalies
    */
   private detectStatisticalAnomalies(
-    data: any[],
-    dataType: string
+    values: Float64Array,
+    dataType: AnomalyDetection['type']
   ): AnomalyDetection[] {
     const anomalies: AnomalyDetection[] = []
 
-    if (data.length === 0) return anomalies
+    if (values.length === 0) return anomalies
 
-    // Calculate mean and standard deviation
-    const values = data.map(
-      (item) => item.value || item.quantity || item.amount
-    )
-    const mean = values.reduce((sum, val) => sum + val, 0) / values.length
-    const variance =
-      values.reduce((sum, val) => sum + Math.pow(val - mean, 2), 0) /
-      values.length
-    const stdDev = Math.sqrt(variance)
-
-    // Detect outliers (values beyond 2 standard deviations)
-    values.forEach((value, index) => {
-      const zScore = Math.abs((value - mean) / stdDev)
-      if (zScore > 2) {
-        anomalies.push({
-          id: `anomaly_${dataType}_${index}`,
-          type: dataType as any,
-          severity: zScore > 3 ? 'critical' : 'warning',
-          description: `Unusual ${dataType} value detected: ${value} (expected: ${mean.toFixed(2)} ± ${stdDev.toFixed(2)})`,
-          confidence: Math.min(100, zScore * 25),
-          detectedAt: new Date(),
-          data: { value, mean, stdDev, zScore },
-        })
+    const { mean, stdDev } = computeMoments(values)
+
+    // A constant series has no outliers
+    if (stdDev === 0) return anomalies
+
+    // Find outliers with a plain bounds check; z-scores and result objects
+    // are only built for the rows that fall outside
+    const lowerBound = mean - this.Z_SCORE_THRESHOLD * stdDev
+    const upperBound = mean + this.Z_SCORE_THRESHOLD * stdDev
+    const outliers: number[] = []
+
+    for (let i = 0; i < values.length; i++) {
+      const value = values[i] as number
+      if (value < lowerBound || value > upperBound) {
+        outliers.push(i)
       }
-    })
+    }
+
+    // Report every outlier, strongest first
+    const ranked = outliers
+      .map((index) => ({
+        index,
+        value: values[index] as number,
+        zScore: Math.abs(((values[index] as number) - mean) / stdDev),
+      }))
+      .sort((a, b) => b.zScore - a.zScore)
+
+    // Every anomaly in this pass shares one detection timestamp
+    const detectedAt = new Date()
+
+    for (const { index, value, zScore } of ranked) {
+      anomalies.push({
+        id: `anomaly_${dataType}_${index}`,
+        type: dataType,
+        severity: zScore > 3 ? 'critical' : 'warning',
+        description: `Unusual ${dataType} value detected: ${value} (expected: ${mean.toFixed(2)} ± ${stdDev.toFixed(2)})`,
+        confidence: Math.min(100, zScore * 25),
+        detectedAt,
+        data: { value, mean, stdDev, zScore },
+      })
+    }
 
     return anomalies
   }
@@ -431,23 +691,10 @@ export class PredictiveAnalytics {
   /**
    * Calculate seasonality factor
    */
-  private calculateSeasonalityFactor(salesData: any[]): number {
+  private calculateSeasonalityFactor(avgMonthlySales: Float64Array): number {
     // Simplified seasonality calculation
     // In production, use FFT or other time series decomposition methods
 
-    const monthlyData = new Array(12).fill(0)
-    const monthlyCount = new Array(12).fill(0)
-
-    salesData.forEach((item) => {
-      const month = new Date(item.created_at).getMonth()
-      monthlyData[month] += item.quantity
-      monthlyCount[month]++
-    })
-
-    const avgMonthlySales = monthlyData.map((total, month) =>
-      monthlyCount[month] > 0 ? total / monthlyCount[month] : 0
-    )
-
     const overallAvg = avgMonthlySales.reduce((sum, avg) => sum + avg, 0) / 12
     const maxMonthlyAvg = Math.max(...avgMonthlySales)
 
@@ -457,24 +704,39 @@ export class PredictiveAnalytics {
   /**
    * Calculate price elasticity
    */
-  private calculatePriceElasticity(priceChanges: any[]): number {
-    if (priceChanges.length < 2) return -1 // Default elasticity
-
-    // Simplified elasticity calculation
-    const sorted = priceChanges.sort((a, b) => a.price - b.price)
-    const midPoint = Math.floor(sorted.length / 2)
+  private calculatePriceElasticity(
+    prices: Float64Array,
+    quantities: Float64Array
+  ): number {
+    if (prices.length < 2) return -1 // Default elasticity
 
-    const lowerHalf = sorted.slice(0, midPoint)
-    const upperHalf = sorted.slice(midPoint)
+    // Simplified elasticity calculation: order sales by price through an
+    // index permutation, then compare the cheaper and dearer halves
+    const order = Uint32Array.from(prices.keys()).sort(
+      (a, b) => (prices[a] as number) - (prices[b] as number) || a - b
+    )
+    const midPoint = Math.floor(order.length / 2)
+
+    let lowerPriceSum = 0
+    let lowerQuantitySum = 0
+    let upperPriceSum = 0
+    let upperQuantitySum = 0
+    for (const [rank, index] of order.entries()) {
+      if (rank < midPoint) {
+        lowerPriceSum += prices[index] as number
+        lowerQuantitySum += quantities[index] as number
+      } else {
+        upperPriceSum += prices[index] as number
+        upperQuantitySum += quantities[index] as number
+      }
+    }
 
-    const lowerAvgPrice =
-      lowerHalf.reduce((sum, item) => sum + item.price, 0) / lowerHalf.length
-    const upperAvgPrice =
-      upperHalf.reduce((sum, item) => sum + item.price, 0) / upperHalf.length
-    const lowerAvgQuantity =
-      lowerHalf.reduce((sum, item) => sum + item.quantity, 0) / lowerHalf.length
-    const upperAvgQuantity =
-      upperHalf.reduce((sum, item) => sum + item.quantity, 0) / upperHalf.length
+    const lowerCount = midPoint
+    const upperCount = order.length - midPoint
+    const lowerAvgPrice = lowerPriceSum / lowerCount
+    const upperAvgPrice = upperPriceSum / upperCount
+    const lowerAvgQuantity = lowerQuantitySum / lowerCount
+    const upperAvgQuantity = upperQuantitySum / upperCount
 
     const priceChange = (upperAvgPrice - lowerAvgPrice) / lowerAvgPrice
     const quantityChange =
@@ -521,21 +783,8 @@ export class PredictiveAnalytics {
    * Calculate seasonality analysis
    */
   private calculateSeasonality(
-    historicalData: any[]
+    avgMonthlySales: Float64Array
   ): Omit<SeasonalityAnalysis, 'productId'> {
-    const monthlyData = new Array(12).fill(0)
-    const monthlyCount = new Array(12).fill(0)
-
-    historicalData.forEach((item) => {
-      const month = new Date(item.created_at).getMonth()
-      monthlyData[month] += item.quantity
-      monthlyCount[month]++
-    })
-
-    const avgMonthlySales = monthlyData.map((total, month) =>
-      monthlyCount[month] > 0 ? total / monthlyCount[month] : 0
-    )
-
     const overallAvg = avgMonthlySales.reduce((sum, avg) => sum + avg, 0) / 12
     const maxAvg = Math.max(...avgMonthlySales)
     const minAvg = Math.min(...avgMonthlySales)
@@ -548,29 +797,14 @@ export class PredictiveAnalytics {
     const lowSeasons: string[] = []
     const seasonalFactors: Record<string, number> = {}
 
-    const monthNames = [
-      'January',
-      'February',
-      'March',
-      'April',
-      'May',
-      'June',
-      'July',
-      'August',
-      'September',
-      'October',
-      'November',
-      'December',
-    ]
-
     avgMonthlySales.forEach((avg, month) => {
       const factor = overallAvg > 0 ? avg / overallAvg : 1
-      seasonalFactors[monthNames[month]] = factor
+      seasonalFactors[MONTH_NAMES[month]] = factor
 
       if (factor > 1.2) {
-        peakSeasons.push(monthNames[month])
+        peakSeasons.push(MONTH_NAMES[month])
       } else if (factor < 0.8) {
-        lowSeasons.push(monthNames[month])
+        lowSeasons.push(MONTH_NAMES[month])
       }
     })
 
@@ -583,55 +817,147 @@ export class PredictiveAnalytics {
   }
 
   // Helper methods for getting data
-  private async getPriceData(timeRange: {
-    start: Date
-    end: Date
-  }): Promise<any[]> {
-    const { data } = await this.supabase
-      .from('order_items')
-      .select('unit_price, created_at')
-      .gte('created_at', timeRange.start.toISOString())
-      .lte('created_at', timeRange.end.toISOString())
-
-    return data || []
+  /**
+   * Page through the rows for a data type and collect its value column into
+   * a single buffer, so no more than one page of row objects is alive at once
+   */
+  private async fetchValueColumn(
+    dataType: AnomalyDetection['type'],
+    timeRange: { start: Date; end: Date }
+  ): Promise<Float64Array> {
+    const { table, column } = ANOMALY_SOURCES[dataType]
+    let values = new Float64Array(this.PAGE_SIZE)
+    let length = 0
+
+    for (let offset = 0; ; offset += this.PAGE_SIZE) {
+      const { data: page, error } = await this.supabase
+        .from(table)
+        .select(column)
+        .gte('created_at', timeRange.start.toISOString())
+        .lte('created_at', timeRange.end.toISOString())
+        .order('created_at', { ascending: true })
+        .order('id', { ascending: true })
+        .range(offset, offset + this.PAGE_SIZE - 1)
+
+      if (error) throw error
+
+      const rows: any[] = page || []
+      if (length + rows.length > values.length) {
+        const grown = new Float64Array(values.length * 2)
+        grown.set(values)
+        values = grown
+      }
+      for (const row of rows) {
+        values[length++] = Number(row[column]) || 0
+      }
+
+      if (rows.length < this.PAGE_SIZE) break
+    }
+
+    return values.subarray(0, length)
   }
 
-  private async getDemandData(timeRange: {
-    start: Date
-    end: Date
-  }): Promise<any[]> {
-    const { data } = await this.supabase
-      .from('order_items')
-      .select('quantity, created_at')
-      .gte('created_at', timeRange.start.toISOString())
-      .lte('created_at', timeRange.end.toISOString())
-
-    return data || []
+  /**
+   * Split product ids into PRODUCT_BATCH_SIZE groups for `in` filters
+   */
+  private batchProductIds(productIds: string[]): string[][] {
+    const batches: string[][] = []
+    for (let i = 0; i < productIds.length; i += this.PRODUCT_BATCH_SIZE) {
+      batches.push(productIds.slice(i, i + this.PRODUCT_BATCH_SIZE))
+    }
+    return batches
   }
 
-  private async getInventoryData(timeRange: {
-    start: Date
-    end: Date
-  }): Promise<any[]> {
-    const { data } = await this.supabase
-      .from('inventory')
-      .select('quantity, created_at')
-      .gte('created_at', timeRange.start.toISOString())
-      .lte('created_at', timeRange.end.toISOString())
-
-    return data || []
+  /**
+   * Summarize order item history for many products with one paged `in`
+   * query per batch of ids. Each page is folded into per-product running
+   * statistics and dropped, so memory stays at one page per batch
+   */
+  private async fetchDemandHistory(
+    productIds: string[],
+    since: Date
+  ): Promise<Map<string, DemandHistory>> {
+    const batches = this.batchProductIds(productIds)
+    const historyByProduct = new Map<string, DemandHistory>()
+
+    await Promise.all(
+      batches.map(async (batch) => {
+        for (let offset = 0; ; offset += this.PAGE_SIZE) {
+          const { data: page, error } = await this.supabase
+            .from('order_items')
+            .select('product_id, quantity, created_at')
+            .in('product_id', batch)
+            .gte('created_at', since.toISOString())
+            .order('created_at', { ascending: true })
+            .order('id', { ascending: true })
+            .range(offset, offset + this.PAGE_SIZE - 1)
+
+          if (error) throw error
+
+          const rows: any[] = page || []
+          for (const row of rows) {
+            let history = historyByProduct.get(row.product_id)
+            if (!history) {
+              history = createDemandHistory()
+              historyByProduct.set(row.product_id, history)
+            }
+            addDemandSample(history, row.quantity, row.created_at)
+          }
+
+          if (rows.length < this.PAGE_SIZE) break
+        }
+      })
+    )
+
+    return historyByProduct
   }
 
-  private async getRevenueData(timeRange: {
-    start: Date
-    end: Date
-  }): Promise<any[]> {
-    const { data } = await this.supabase
-      .from('orders')
-      .select('total_amount, created_at')
-      .gte('created_at', timeRange.start.toISOString())
-      .lte('created_at', timeRange.end.toISOString())
-
-    return data || []
+  /**
+   * Look up unexpired precomputed forecasts for the requested period, keyed
+   * by product; lookup failures fall back to live computation
+   */
+  private async getStoredDemandForecasts(
+    organizationId: string,
+    productIds: string[],
+    forecastPeriod: number
+  ): Promise<Map<string, DemandForecast>> {
+    const stored = new Map<string, DemandForecast>()
+    if (productIds.length === 0) return stored
+
+    try {
+      const now = new Date().toISOString()
+      const batches = this.batchProductIds(productIds)
+
+      const results = await Promise.all(
+        batches.map((batch) =>
+          this.supabase
+            .from('ai_predictions')
+            .select('entity_id, prediction_value')
+            .eq('organization_id', organizationId)
+            .eq('prediction_type', this.STORED_FORECAST_TYPE)
+            .eq('entity_type', 'product')
+            .eq('model_version', this.FORECAST_MODEL_VERSION)
+            .in('entity_id', batch)
+            // Oldest first, so the newest unexpired run is applied last
+            .order('prediction_date', { ascending: true })
+            .gt('expires_at', now)
+        )
+      )
+
+      for (const { data, error } of results) {
+        if (error) throw error
+
+        for (const row of data || []) {
+          const { forecastPeriod: period, ...forecast } = row.prediction_value
+          if (period !== forecastPeriod) continue
+          stored.set(row.entity_id, { productId: row.entity_id, ...forecast })
+        }
+      }
+    } catch (error) {
+      console.error('Error reading stored demand forecasts:', error)
+      stored.clear()
+    }
+
+    return stored
   }
 }
@@ -0,0 +1,64 @@
+/**
+ * Seasonality caching for TruthSource analytics
+ */
+
+import type {
+  PredictiveAnalytics,
+  SeasonalityAnalysis,
+} from '@/lib/analytics/predictive-analytics'
+import { getQueryCache } from '@/lib/cache/query-cache'
+
+// Seasonal patterns move over days, not minutes
+const SEASONALITY_CACHE_TTL = 24 * 60 * 60 // seconds
+
+// Analyses being computed, so concurrent misses share one database round trip
+const inFlight = new Map<string, Promise<SeasonalityAnalysis[]>>()
+
+/**
+ * Analyze seasonality through a per-organization cache. Results are not
+ * cached when empty, since analyzeSeasonality also returns no analyses
+ * when the lookup fails
+ */
+export async function getCachedSeasonality(
+  analytics: PredictiveAnalytics,
+  organizationId: string,
+  productIds: string[]
+): Promise<SeasonalityAnalysis[]> {
+  const cache = getQueryCache(`seasonality:${organizationId}`)
+  const sortedIds = [...productIds].sort()
+  const params = [sortedIds]
+
+  const cached = await cache.get<SeasonalityAnalysis[]>(
+    'analyzeSeasonality',
+    params
+  )
+  if (cached) {
+    return cached
+  }
+
+  const key = `${organizationId}:${sortedIds.join(',')}`
+  const pending = inFlight.get(key)
+  if (pending) {
+    return pending
+  }
+
+  const computation = (async () => {
+    const analyses = await analytics.analyzeSeasonality(productIds)
+    if (analyses.length > 0) {
+      await cache.set(
+        'analyzeSeasonality',
+        analyses,
+        params,
+        SEASONALITY_CACHE_TTL
+      )
+    }
+    return analyses
+  })()
+
+  inFlight.set(key, computation)
+  try {
+    return await computation
+  } finally {
+    inFlight.delete(key)
+  }
+}
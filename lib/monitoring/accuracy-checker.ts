@@ -474,40 +474,52 @@ export class AccuracyChecker extends EventEmitter {
   }
 
   private getEditDistance(str1: string, str2: string): number {
-    const matrix: number[][] = []
-
-    for (let i = 0; i <= str2.length; i++) {
-      matrix[i] = [i]
+    // Levenshtein distance keeping only two rows of the DP table instead of
+    // the full (str2.length + 1) x (str1.length + 1) matrix, with str1
+    // converted to char codes once rather than re-read on every comparison
+    const codes = new Array(str1.length)
+    for (let j = 0; j < str1.length; j++) {
+      codes[j] = str1.charCodeAt(j)
     }
 
+    let previous = new Array(str1.length + 1)
+    let current = new Array(str1.length + 1)
+
     for (let j = 0; j <= str1.length; j++) {
-      matrix[0][j] = j
+      previous[j] = j
     }
 
     for (let i = 1; i <= str2.length; i++) {
+      const code = str2.charCodeAt(i - 1)
+      current[0] = i
+
       for (let j = 1; j <= str1.length; j++) {
-        if (str2.charAt(i - 1) === str1.charAt(j - 1)) {
-          matrix[i][j] = matrix[i - 1][j - 1]
+        if (code === codes[j - 1]) {
+          current[j] = previous[j - 1]
         } else {
-          matrix[i][j] = Math.min(
-            matrix[i - 1][j - 1] + 1,
-            matrix[i][j - 1] + 1,
-            matrix[i - 1][j] + 1
+          current[j] = Math.min(
+            previous[j - 1] + 1,
+            current[j - 1] + 1,
+            previous[j] + 1
           )
         }
       }
+
+      const swap = previous
+      previous = current
+      current = swap
     }
 
-    return matrix[str2.length][str1.length]
+    return previous[str1.length]
   }
 
   private groupBySeverity(discrepancies: DiscrepancyResult[]) {
-    return {
-      critical: discrepancies.filter((d) => d.severity === 'critical').length,
-      high: discrepancies.filter((d) => d.severity === 'high').length,
-      medium: discrepancies.filter((d) => d.severity === 'medium').length,
-      low: discrepancies.filter((d) => d.severity === 'low').length,
+    // Single pass instead of one filter per severity level
+    const counts = { critical: 0, high: 0, medium: 0, low: 0 }
+    for (const discrepancy of discrepancies) {
+      counts[discrepancy.severity]++
     }
+    return counts
   }
 
   private groupByType(discrepancies: DiscrepancyResult[]) {
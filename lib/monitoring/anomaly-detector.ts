@@ -16,6 +16,15 @@ interface HistoricalDiscrepancy {
   timestamp: Date
 }
 
+// Weight of each discrepancy severity when scoring a group
+const SEVERITY_WEIGHTS: Record<DiscrepancyResult['severity'], number> =
+  Object.freeze({
+    critical: 1.0,
+    high: 0.7,
+    medium: 0.4,
+    low: 0.1,
+  })
+
 export class AnomalyDetector {
   private supabase = createAdminClient()
 
@@ -29,16 +38,16 @@ export class AnomalyDetector {
   ): Promise<AnomalyResult[]> {
     const anomalies: AnomalyResult[] = []
 
-    // Group discrepancies by entity type and field
-    const groupedDiscrepancies = this.groupDiscrepancies(config.discrepancies)
+    // Group discrepancies and history by entity type and field once, rather
+    // than rescanning the full history for every group
+    const groupedDiscrepancies = this.groupByEntityField(config.discrepancies)
+    const groupedHistory = this.groupByEntityField(config.historicalData)
 
     for (const [key, discrepancies] of Object.entries(groupedDiscrepancies)) {
-      const [entityType, fieldName] = key.split(':')
+      const [entityType] = key.split(':')
 
       // Get historical data for this entity/field combination
-      const historicalData = config.historicalData.filter(
-        (h) => h.entityType === entityType && h.fieldName === fieldName
-      )
+      const historicalData = groupedHistory[key] || []
 
       if (historicalData.length >= this.MIN_HISTORICAL_POINTS) {
         // Statistical anomaly detection
@@ -70,17 +79,17 @@ export class AnomalyDetector {
     return this.deduplicateAndRankAnomalies(anomalies)
   }
 
-  private groupDiscrepancies(
-    discrepancies: DiscrepancyResult[]
-  ): Record<string, DiscrepancyResult[]> {
-    const grouped: Record<string, DiscrepancyResult[]> = {}
+  private groupByEntityField<
+    T extends { entityType: string; fieldName: string }
+  >(items: T[]): Record<string, T[]> {
+    const grouped: Record<string, T[]> = {}
 
-    for (const discrepancy of discrepancies) {
-      const key = `${discrepancy.entityType}:${discrepancy.fieldName}`
+    for (const item of items) {
+      const key = `${item.entityType}:${item.fieldName}`
       if (!grouped[key]) {
         grouped[key] = []
       }
-      grouped[key].push(discrepancy)
+      grouped[key].push(item)
     }
 
     return grouped
@@ -93,10 +102,24 @@ export class AnomalyDetector {
   ): AnomalyResult[] {
     const anomalies: AnomalyResult[] = []
 
-    // Calculate historical statistics
-    const historicalCounts = historicalData.map((h) => h.count)
-    const mean = this.calculateMean(historicalCounts)
-    const stdDev = this.calculateStandardDeviation(historicalCounts, mean)
+    // Calculate count and severity statistics in one pass over the history
+    let countSum = 0
+    let countSumSquares = 0
+    let severitySum = 0
+
+    for (const point of historicalData) {
+      countSum += point.count
+      countSumSquares += point.count * point.count
+      severitySum += point.avgSeverity
+    }
+
+    const historyLength = historicalData.length
+    const mean = historyLength > 0 ? countSum / historyLength : 0
+    const stdDev = Math.sqrt(
+      this.varianceFromSums(historyLength, countSum, countSumSquares)
+    )
+    const historicalAvgSeverity =
+      historyLength > 0 ? severitySum / historyLength : 0
 
     // Current count
     const currentCount = discrepancies.length
@@ -119,7 +142,7 @@ export class AnomalyDetector {
     // Check severity distribution
     const severityAnomaly = this.detectSeverityAnomaly(
       discrepancies,
-      historicalData
+      historicalAvgSeverity
     )
     if (severityAnomaly) {
       anomalies.push(severityAnomaly)
@@ -180,11 +203,21 @@ export class AnomalyDetector {
   ): AnomalyResult[] {
     const anomalies: AnomalyResult[] = []
 
-    // Critical severity threshold
-    const criticalCount = discrepancies.filter(
-      (d) => d.severity === 'critical'
-    ).length
+    // Count everything the thresholds need in one pass
+    let criticalCount = 0
+    let highConfidenceMismatches = 0
+    let staleCount = 0
+
+    for (const d of discrepancies) {
+      if (d.severity === 'critical') criticalCount++
+      if (d.discrepancyType === 'mismatch' && d.confidence > 0.9) {
+        highConfidenceMismatches++
+      } else if (d.discrepancyType === 'stale') {
+        staleCount++
+      }
+    }
 
+    // Critical severity threshold
     if (criticalCount > 0) {
       anomalies.push({
         entityId: entityType,
@@ -197,10 +230,6 @@ export class AnomalyDetector {
     }
 
     // High confidence mismatches
-    const highConfidenceMismatches = discrepancies.filter(
-      (d) => d.discrepancyType === 'mismatch' && d.confidence > 0.9
-    ).length
-
     if (highConfidenceMismatches > 5) {
       anomalies.push({
         entityId: entityType,
@@ -213,9 +242,6 @@ export class AnomalyDetector {
     }
 
     // Stale data threshold
-    const staleCount = discrepancies.filter(
-      (d) => d.discrepancyType === 'stale'
-    ).length
     const stalePercentage =
       discrepancies.length > 0 ? (staleCount / discrepancies.length) * 100 : 0
 
@@ -235,16 +261,11 @@ export class AnomalyDetector {
 
   private detectSeverityAnomaly(
     discrepancies: DiscrepancyResult[],
-    historicalData: HistoricalDiscrepancy[]
+    historicalAvgSeverity: number
   ): AnomalyResult | null {
     // Calculate current severity distribution
     const currentSeverityScore = this.calculateSeverityScore(discrepancies)
 
-    // Calculate historical average severity
-    const historicalAvgSeverity = this.calculateMean(
-      historicalData.map((h) => h.avgSeverity)
-    )
-
     const severityDeviation = Math.abs(
       currentSeverityScore - historicalAvgSeverity
     )
@@ -287,92 +308,78 @@ export class AnomalyDetector {
   }
 
   private checkWeeklyPattern(data: HistoricalDiscrepancy[]): TimePattern {
-    // Group by day of week
-    const byDayOfWeek: Record<number, number[]> = {}
-
-    for (const point of data) {
-      const dayOfWeek = point.timestamp.getDay()
-      if (!byDayOfWeek[dayOfWeek]) {
-        byDayOfWeek[dayOfWeek] = []
-      }
-      byDayOfWeek[dayOfWeek].push(point.count)
-    }
-
-    // Calculate variance within each day
-    let totalVariance = 0
-    let totalMean = 0
-    let dayCount = 0
-
-    for (const [day, counts] of Object.entries(byDayOfWeek)) {
-      if (counts.length > 1) {
-        const mean = this.calculateMean(counts)
-        const variance = this.calculateVariance(counts, mean)
-        totalVariance += variance
-        totalMean += mean
-        dayCount++
-      }
-    }
-
-    // Calculate overall variance
-    const allCounts = data.map((d) => d.count)
-    const overallVariance = this.calculateVariance(
-      allCounts,
-      this.calculateMean(allCounts)
+    // Bucket by day of week
+    return this.buildTimePattern(data, 'weekly', 7, (timestamp) =>
+      timestamp.getDay()
     )
-
-    // Pattern confidence based on variance reduction
-    const confidence =
-      overallVariance > 0 && dayCount > 0
-        ? 1 - totalVariance / dayCount / overallVariance
-        : 0
-
-    return {
-      type: 'weekly',
-      confidence,
-      parameters: byDayOfWeek,
-    }
   }
 
   private checkDailyPattern(data: HistoricalDiscrepancy[]): TimePattern {
-    // Group by hour of day
-    const byHourOfDay: Record<number, number[]> = {}
+    // Bucket by hour of day
+    return this.buildTimePattern(data, 'daily', 24, (timestamp) =>
+      timestamp.getHours()
+    )
+  }
+
+  private buildTimePattern(
+    data: HistoricalDiscrepancy[],
+    type: TimePattern['type'],
+    bucketCount: number,
+    bucketOf: (timestamp: Date) => number
+  ): TimePattern {
+    // Accumulate count, sum and sum of squares per bucket in a single pass
+    // instead of collecting an array of counts for every bucket
+    const counts = new Array(bucketCount).fill(0)
+    const sums = new Array(bucketCount).fill(0)
+    const sumSquares = new Array(bucketCount).fill(0)
 
     for (const point of data) {
-      const hourOfDay = point.timestamp.getHours()
-      if (!byHourOfDay[hourOfDay]) {
-        byHourOfDay[hourOfDay] = []
-      }
-      byHourOfDay[hourOfDay].push(point.count)
+      const bucket = bucketOf(point.timestamp)
+      counts[bucket] += 1
+      sums[bucket] += point.count
+      sumSquares[bucket] += point.count * point.count
     }
 
-    // Similar calculation as weekly pattern
+    // Calculate variance within each bucket and across all points
     let totalVariance = 0
-    let hourCount = 0
-
-    for (const [hour, counts] of Object.entries(byHourOfDay)) {
-      if (counts.length > 1) {
-        const mean = this.calculateMean(counts)
-        const variance = this.calculateVariance(counts, mean)
-        totalVariance += variance
-        hourCount++
+    let populatedBuckets = 0
+    let overallSum = 0
+    let overallSumSquares = 0
+    const means = new Array(bucketCount).fill(0)
+
+    for (let bucket = 0; bucket < bucketCount; bucket++) {
+      const n = counts[bucket]
+      const sum = sums[bucket]
+      const sumSq = sumSquares[bucket]
+
+      overallSum += sum
+      overallSumSquares += sumSq
+
+      if (n > 0) {
+        means[bucket] = sum / n
+      }
+      if (n > 1) {
+        totalVariance += this.varianceFromSums(n, sum, sumSq)
+        populatedBuckets++
       }
     }
 
-    const allCounts = data.map((d) => d.count)
-    const overallVariance = this.calculateVariance(
-      allCounts,
-      this.calculateMean(allCounts)
+    const overallVariance = this.varianceFromSums(
+      data.length,
+      overallSum,
+      overallSumSquares
     )
 
+    // Pattern confidence based on variance reduction
     const confidence =
-      overallVariance > 0 && hourCount > 0
-        ? 1 - totalVariance / hourCount / overallVariance
+      overallVariance > 0 && populatedBuckets > 0
+        ? 1 - totalVariance / populatedBuckets / overallVariance
         : 0
 
     return {
-      type: 'daily',
+      type,
       confidence,
-      parameters: byHourOfDay,
+      bucketMeans: means,
     }
   }
 
@@ -380,16 +387,9 @@ export class AnomalyDetector {
     pattern: TimePattern,
     currentTime: Date
   ): number {
-    if (pattern.type === 'weekly') {
-      const dayOfWeek = currentTime.getDay()
-      const dayCounts = pattern.parameters[dayOfWeek] || []
-      return dayCounts.length > 0 ? this.calculateMean(dayCounts) : 0
-    } else if (pattern.type === 'daily') {
-      const hourOfDay = currentTime.getHours()
-      const hourCounts = pattern.parameters[hourOfDay] || []
-      return hourCounts.length > 0 ? this.calculateMean(hourCounts) : 0
-    }
-    return 0
+    const bucket =
+      pattern.type === 'weekly' ? currentTime.getDay() : currentTime.getHours()
+    return pattern.bucketMeans[bucket] || 0
   }
 
   private detectSuddenChange(
@@ -398,11 +398,17 @@ export class AnomalyDetector {
   ): AnomalyResult | null {
     if (historicalData.length < 2) return null
 
-    // Get most recent historical point
-    const sortedHistory = [...historicalData].sort(
-      (a, b) => b.timestamp.getTime() - a.timestamp.getTime()
-    )
-    const mostRecent = sortedHistory[0]
+    // Get most recent historical point with a single scan instead of
+    // copying and sorting the whole history
+    let mostRecent = historicalData[0]
+    let mostRecentTime = mostRecent.timestamp.getTime()
+    for (const point of historicalData) {
+      const time = point.timestamp.getTime()
+      if (time > mostRecentTime) {
+        mostRecent = point
+        mostRecentTime = time
+      }
+    }
 
     // Calculate change rate
     const changeRate =
@@ -429,16 +435,9 @@ export class AnomalyDetector {
   }
 
   private calculateSeverityScore(discrepancies: DiscrepancyResult[]): number {
-    const severityWeights = {
-      critical: 1.0,
-      high: 0.7,
-      medium: 0.4,
-      low: 0.1,
-    }
-
     let totalScore = 0
     for (const discrepancy of discrepancies) {
-      totalScore += severityWeights[discrepancy.severity] || 0
+      totalScore += SEVERITY_WEIGHTS[discrepancy.severity] || 0
     }
 
     return discrepancies.length > 0 ? totalScore / discrepancies.length : 0
@@ -467,23 +466,11 @@ export class AnomalyDetector {
   }
 
   // Statistical helper methods
-  private calculateMean(values: number[]): number {
-    if (values.length === 0) return 0
-    return values.reduce((sum, val) => sum + val, 0) / values.length
-  }
-
-  private calculateStandardDeviation(values: number[], mean: number): number {
-    if (values.length <= 1) return 0
-
-    const variance = this.calculateVariance(values, mean)
-    return Math.sqrt(variance)
-  }
-
-  private calculateVariance(values: number[], mean: number): number {
-    if (values.length <= 1) return 0
+  private varianceFromSums(n: number, sum: number, sumSq: number): number {
+    if (n <= 1) return 0
 
-    const squaredDiffs = values.map((val) => Math.pow(val - mean, 2))
-    return squaredDiffs.reduce((sum, val) => sum + val, 0) / (values.length - 1)
+    // Sample variance; clamp rounding error on near-constant buckets
+    return Math.max(0, (sumSq - (sum * sum) / n) / (n - 1))
   }
 
   private zScoreToConfidence(zScore: number): number {
@@ -500,5 +487,6 @@ export class AnomalyDetector {
 interface TimePattern {
   type: 'daily' | 'weekly'
   confidence: number
-  parameters: Record<number, number[]>
+  // Mean count per bucket (day of week or hour of day)
+  bucketMeans: number[]
 }
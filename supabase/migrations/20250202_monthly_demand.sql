@@ -0,0 +1,34 @@
+-- Server-side monthly demand aggregates for seasonality analysis
+-- Returns one row per product and calendar month instead of every order item
+-- in the window, so PredictiveAnalytics.analyzeSeasonality receives at most
+-- twelve rows per product
+
+CREATE OR REPLACE FUNCTION get_monthly_demand(
+  p_product_ids UUID[],
+  p_since TIMESTAMPTZ
+)
+RETURNS TABLE(
+  product_id UUID,
+  month INTEGER,
+  avg_quantity DECIMAL,
+  total_quantity BIGINT
+) AS $$
+  SELECT
+    oi.product_id,
+    EXTRACT(MONTH FROM oi.created_at)::INTEGER AS month,
+    AVG(oi.quantity) AS avg_quantity,
+    SUM(oi.quantity) AS total_quantity
+  FROM order_items oi
+  WHERE oi.product_id = ANY(p_product_ids)
+    AND oi.created_at >= p_since
+  GROUP BY oi.product_id, EXTRACT(MONTH FROM oi.created_at)
+  ORDER BY oi.product_id, month;
+$$ LANGUAGE sql STABLE;
+
+-- Supports the product/date range scan above
+CREATE INDEX IF NOT EXISTS idx_order_items_product_created_at
+  ON order_items(product_id, created_at);
+
+GRANT EXECUTE ON FUNCTION get_monthly_demand TO authenticated;
+
+COMMENT ON FUNCTION get_monthly_demand IS 'Aggregates order item quantities per product and calendar month for seasonality analysis';
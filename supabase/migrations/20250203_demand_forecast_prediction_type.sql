@@ -0,0 +1,13 @@
+-- Give the nightly precomputed demand forecasts their own prediction type
+-- so they no longer share the daily unique key with AIService's on-demand
+-- 'demand' predictions
+
+-- Drop the existing constraint
+ALTER TABLE ai_predictions
+DROP CONSTRAINT IF EXISTS ai_predictions_prediction_type_check;
+
+-- Add the updated constraint including the precomputed forecast type
+ALTER TABLE ai_predictions
+ADD CONSTRAINT ai_predictions_prediction_type_check
+CHECK (prediction_type IN ('demand', 'demand_forecast', 'reorder', 'price', 'anomaly'));
+
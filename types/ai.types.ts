@@ -3,7 +3,7 @@
 export type InsightType = 'summary' | 'recommendation' | 'alert' | 'trend'
 export type AnomalyType = 'stock_out' | 'low_stock' | 'large_order' | 'price_volatility' | 'inventory_spike'
 export type Severity = 'info' | 'warning' | 'critical'
-export type PredictionType = 'demand' | 'reorder' | 'price' | 'anomaly'
+export type PredictionType = 'demand' | 'demand_forecast' | 'reorder' | 'price' | 'anomaly'
 
 export interface AIInsight {
   id: string